@@ -0,0 +1,130 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
+
+from lru import LRUCache
+
+
+PRICE_COLUMNS = ['Gold Price', 'SP500 Price', '10 Year T Note Yield']
+PAIRS = [
+    ('Gold Price', 'SP500 Price'),
+    ('Gold Price', '10 Year T Note Yield'),
+    ('SP500 Price', '10 Year T Note Yield'),
+]
+CRITICAL_LEVELS = ['90%', '95%', '99%']
+
+# Results are keyed by the bytes they were computed from, so any view of the same
+# numbers (another session, the same range picked again) is a cache hit.
+_results = LRUCache(maxsize=1024)
+
+
+def content_key(name, arrays, params=()):
+    digest = hashlib.blake2b(name.encode(), digest_size=16)
+    digest.update(repr(params).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def _memoized(name, arrays, params, compute):
+    return _results.get_or_compute(content_key(name, arrays, params), compute)
+
+
+# Shapiro-Wilk normality p-value (nan when the range is too short to test)
+def shapiro_pvalue(values):
+    if len(values) < 3:
+        return float('nan')
+    return _memoized('shapiro', [values], (), lambda: float(stats.shapiro(values).pvalue))
+
+
+# Average ranks for ties, computed in one vectorized sort
+def ranks(values):
+    return stats.rankdata(values)
+
+
+# Spearman's rho as the Pearson correlation of the vectorized ranks
+def spearman(x, y):
+    def compute():
+        if len(x) < 2:
+            return float('nan')
+        return float(np.corrcoef(ranks(x), ranks(y))[0, 1])
+    return _memoized('spearman', [x, y], (), compute)
+
+
+# Kendall's tau-b. SciPy counts discordant pairs with a merge sort (Knight's algorithm),
+# which is O(n log n) instead of comparing every pair.
+def kendall(x, y):
+    def compute():
+        if len(x) < 2:
+            return float('nan')
+        return float(stats.kendalltau(x, y).statistic)
+    return _memoized('kendall', [x, y], (), compute)
+
+
+# Johansen cointegration test on the given series (one array per column)
+def johansen(series, det_order=0, k_ar_diff=1):
+    def compute():
+        result = coint_johansen(np.column_stack(series), det_order, k_ar_diff)
+        return {
+            'eigenvalues': result.eig,
+            'trace': result.lr1,
+            'critical': result.cvt,
+        }
+    return _memoized('johansen', series, (det_order, k_ar_diff), compute)
+
+
+# Computations over already sliced arrays, e.g. views into shared memory in a worker
+# process; only these small results are sent back
+def normality_rows(arrays):
+    return [shapiro_pvalue(values) for values in arrays]
+
+
+# arrays holds the pairs flattened: x0, y0, x1, y1, ...
+def correlation_rows(arrays):
+    return [(spearman(x, y), kendall(x, y)) for x, y in zip(arrays[::2], arrays[1::2])]
+
+
+def johansen_result(arrays, det_order=0, k_ar_diff=1):
+    return johansen(arrays, det_order, k_ar_diff)
+
+
+# Tables for the Analysis tab
+def normality_frame(columns, pvalues):
+    return pd.DataFrame(list(zip(columns, pvalues)), columns=['Series', 'Shapiro-Wilk p-value'])
+
+
+def correlation_frame(pairs, rows):
+    rows = [(f'{a} - {b}', rho, tau) for (a, b), (rho, tau) in zip(pairs, rows)]
+    return pd.DataFrame(rows, columns=['Pair', "Spearman's rho", "Kendall's tau"])
+
+
+def johansen_frame(columns, result):
+    table = pd.DataFrame({
+        'Null hypothesis': [f'r <= {rank}' for rank in range(len(columns))],
+        'Eigenvalue': result['eigenvalues'],
+        'Trace statistic': result['trace'],
+    })
+    for i, level in enumerate(CRITICAL_LEVELS):
+        table[f'Critical value ({level})'] = result['critical'][:, i]
+    return table
+
+
+# The same tables computed in this process over one date range of a DateSlicer
+def normality_table(slicer, columns, start, end):
+    arrays = [slicer.slice(column, start, end).values for column in columns]
+    return normality_frame(columns, normality_rows(arrays))
+
+
+def correlation_table(slicer, pairs, start, end):
+    arrays = [slicer.slice(column, start, end).values for pair in pairs for column in pair]
+    return correlation_frame(pairs, correlation_rows(arrays))
+
+
+def johansen_table(slicer, columns, start, end, det_order=0, k_ar_diff=1):
+    arrays = [slicer.slice(column, start, end).values for column in columns]
+    return johansen_frame(columns, johansen_result(arrays, det_order, k_ar_diff))
@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pyarrow as pa  # noqa: E402
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import synthetic  # noqa: E402
+
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+# rows x instruments multipliers of final_data.parquet
+DEFAULT_SCALES = ['1x1', '10x1', '100x1', '1000x1', '10x10', '1x100']
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+
+
+# Serialized size of every ForwardMsg the app sends, i.e. what a browser would receive
+class PayloadMeter:
+
+    def __init__(self):
+        self.bytes = 0
+        self._enqueue = ForwardMsgQueue.enqueue
+
+    def __enter__(self):
+        meter = self
+        original = self._enqueue
+
+        def enqueue(queue, msg):
+            meter.bytes += msg.ByteSize()
+            return original(queue, msg)
+
+        ForwardMsgQueue.enqueue = enqueue
+        return self
+
+    def __exit__(self, *exc):
+        ForwardMsgQueue.enqueue = self._enqueue
+
+
+# Widget by label; a trailing ' (...)' in the label, e.g. a page count, is ignored
+def _widget(elements, label):
+    for element in elements:
+        if element.label.split(' (')[0] == label:
+            return element
+    raise LookupError(label)
+
+
+def click(label):
+    return lambda at: _widget(at.sidebar.button, label).click()
+
+
+def sidebar_radio(label, value):
+    return lambda at: _widget(at.sidebar.radio, label).set_value(value)
+
+
+def sidebar_select(label, value):
+    return lambda at: _widget(at.sidebar.selectbox, label).set_value(value)
+
+
+def sidebar_toggle(label):
+    return lambda at: _widget(at.sidebar.toggle, label).set_value(True)
+
+
+def check(label):
+    return lambda at: _widget(at.checkbox, label).check()
+
+
+def number(label, value):
+    return lambda at: _widget(at.number_input, label).set_value(value)
+
+
+def nothing(at):
+    return at
+
+
+# Each scenario is a list of (step name, widget action); steps run in order on one session
+SCENARIOS = {
+    'main_page': [('first paint', nothing)],
+    'qa_page': [('open', click('Project Reflections'))],
+    'data_source_page': [
+        ('open', click('Data Sources')),
+        ('show entire data', check('Show entire data')),
+        ('next page', number('Page', 2)),
+    ],
+    'interactive_data': [
+        ('open', click('Interactive Data / Analysis / Charts')),
+        ('daily', sidebar_radio('Resolution', 'Daily')),
+        ('min/max', sidebar_radio('Downsampling', 'Min/Max')),
+        ('commodity', sidebar_select('Select Commodity', 'SP500')),
+        ('return', sidebar_radio('Select Metric Type', 'Daily Return')),
+        ('drawdown', sidebar_radio('Select Metric Type', 'Drawdown')),
+    ],
+    'browser_filtering': [
+        ('open', click('Interactive Data / Analysis / Charts')),
+        ('browser mode', sidebar_toggle('Filter dates in the browser')),
+        ('linked series', lambda at: _widget(at.sidebar.multiselect, 'Linked series').set_value(['Gold Price'])),
+        ('commodity', sidebar_select('Select Commodity', 'SP500')),
+    ],
+    'analysis': [
+        ('open', click('Interactive Data / Analysis / Charts')),
+        ('analysis tab', sidebar_radio('Select Tab', 'Analysis')),
+    ],
+    'charts': [
+        ('open', click('Interactive Data / Analysis / Charts')),
+        ('charts tab', sidebar_radio('Select Tab', 'Charts')),
+    ],
+}
+
+
+# Wall time, Python/Arrow memory and payload of one rerun.
+# tracemalloc slows allocation-heavy code down, so memory is only traced when asked for.
+def measure(at, timeout, trace_memory=False):
+    if trace_memory:
+        tracemalloc.start()
+    arrow_before = pa.total_allocated_bytes()
+    with PayloadMeter() as meter:
+        started = time.perf_counter()
+        at.run(timeout=timeout)
+        wall = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    error = at.exception[0].message if at.exception else None
+    return {
+        'wall_ms': wall * 1000,
+        'peak_python_bytes': peak,
+        'arrow_bytes_delta': pa.total_allocated_bytes() - arrow_before,
+        'payload_bytes': meter.bytes,
+        'error': error,
+    }
+
+
+def run_scenario(name, steps, repeat, timeout):
+    results = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    # widgets only exist after a first run; that run is measured by the main_page scenario
+    if steps[0][1] is not nothing:
+        at.run(timeout=timeout)
+    for step, action in steps:
+        try:
+            action(at)
+        except LookupError as exc:
+            results.append({'scenario': name, 'step': step, 'error': f'widget not found: {exc}'})
+            break
+        runs = [measure(at, timeout)]
+        # the same widget state rerun again: what every later interaction costs
+        runs += [measure(at, timeout) for _ in range(repeat - 1)]
+        traced = measure(at, timeout, trace_memory=True)
+        warm = runs[1:] or runs
+        results.append({
+            'scenario': name,
+            'step': step,
+            'first_wall_ms': runs[0]['wall_ms'],
+            'wall_ms': statistics.median(run['wall_ms'] for run in warm),
+            'peak_python_bytes': traced['peak_python_bytes'],
+            'arrow_bytes_delta': runs[0]['arrow_bytes_delta'],
+            'payload_bytes': runs[0]['payload_bytes'],
+            'error': runs[0]['error'],
+        })
+    return results
+
+
+def run(scales, scenarios, repeat, timeout):
+    results = []
+    original = os.path.join(ROOT, synthetic.SOURCE_PATH)
+    cwd = os.getcwd()
+    for scale in scales:
+        rows, instruments = (int(part) for part in scale.split('x'))
+        with tempfile.TemporaryDirectory() as workdir:
+            # the app reads final_data.parquet relative to the working directory
+            synthetic.write(os.path.join(workdir, synthetic.SOURCE_PATH), rows, instruments, original)
+            os.chdir(workdir)
+            try:
+                for name in scenarios:
+                    for result in run_scenario(name, SCENARIOS[name], repeat, timeout):
+                        result['scale'] = scale
+                        results.append(result)
+                        print(f"{scale:>7} {name:>17} {result['step']:>16} "
+                              f"{result.get('wall_ms', float('nan')):9.1f} ms "
+                              f"{result.get('payload_bytes', 0):>10} B  {result.get('error') or ''}")
+            finally:
+                os.chdir(cwd)
+    return results
+
+
+# Steps that got slower or heavier than the baseline by more than tolerance
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    previous = {(r['scale'], r['scenario'], r['step']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get((result['scale'], result['scenario'], result['step']))
+        if before is None:
+            continue
+        for field in ('wall_ms', 'payload_bytes', 'peak_python_bytes'):
+            old, new = before.get(field), result.get(field)
+            if old and new and new > old * (1 + tolerance):
+                regressions.append((result['scale'], result['scenario'], result['step'], field, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless per-page rerun benchmarks for app.py.')
+    parser.add_argument('--scales', nargs='+', default=DEFAULT_SCALES,
+                        help='rows x instruments multipliers, e.g. 10x1 1x100')
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run(args.scales, args.scenarios, args.repeat, args.timeout)
+    report = {
+        'meta': {'python': platform.python_version(), 'machine': platform.machine(),
+                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': args.repeat},
+        'results': results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'results written to {args.out}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for scale, scenario, step, field, old, new in regressions:
+            print(f'REGRESSION {scale} {scenario}/{step} {field}: {old:.0f} -> {new:.0f}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+# Navigation button that opens each page (None: the default page)
+PAGES = {
+    'main_page': None,
+    'project_reflections_page': 'Project Reflections',
+    'data_sources_page': 'Data Sources',
+    'app_page': 'Interactive Data / Analysis / Charts',
+}
+HEAVY_MODULES = ['pandas', 'pyarrow', 'plotly.express', 'scipy', 'statsmodels']
+DEFAULT_TRIALS = 3
+
+
+# Runs in a fresh interpreter: first paint, first display of the page, and a warm rerun
+def child(page):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    started = time.perf_counter()
+    at.run()
+    first_paint = time.perf_counter() - started
+    page_first = first_paint
+    if PAGES[page] is not None:
+        button = next(button for button in at.sidebar.button if button.label == PAGES[page])
+        started = time.perf_counter()
+        button.click().run()
+        page_first = time.perf_counter() - started
+    started = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - started
+    print(json.dumps({
+        'first_paint_ms': first_paint * 1000,
+        'page_first_ms': page_first * 1000,
+        'rerun_ms': rerun * 1000,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules],
+        'error': at.exception[0].message if at.exception else None,
+    }))
+
+
+def measure(page, trials):
+    samples = []
+    for _ in range(trials):
+        output = subprocess.run([sys.executable, __file__, '--child', page], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'first_paint_ms': statistics.median(sample['first_paint_ms'] for sample in samples),
+        'page_first_ms': statistics.median(sample['page_first_ms'] for sample in samples),
+        'rerun_ms': statistics.median(sample['rerun_ms'] for sample in samples),
+        'heavy_modules': samples[-1]['heavy_modules'],
+        'error': samples[-1]['error'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start first paint and rerun time of each page, '
+                                                 'every sample in a fresh interpreter.')
+    parser.add_argument('--trials', type=int, default=DEFAULT_TRIALS)
+    parser.add_argument('--out', help='write the results as JSON')
+    parser.add_argument('--child', choices=list(PAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    results = {page: measure(page, args.trials) for page in PAGES}
+    for page, result in results.items():
+        print(f"{page:>25}  first paint {result['first_paint_ms']:7.0f} ms  "
+              f"page {result['page_first_ms']:7.0f} ms  rerun {result['rerun_ms']:6.0f} ms  "
+              f"imports {', '.join(result['heavy_modules']) or '-'}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
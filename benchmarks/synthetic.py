@@ -0,0 +1,72 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+SOURCE_PATH = 'final_data.parquet'
+LEVEL_COLUMNS = {
+    'SP500': 'SP500 Price',
+    'Gold': 'Gold Price',
+    '10 Year T Note': '10 Year T Note Yield',
+}
+
+
+# Synthetic version of final_data.parquet with rows_factor times the rows and
+# instruments_factor times the instruments, in the same wide schema.
+#
+# Extra rows keep the original 2001-2019 span and become intraday timestamps; the
+# original series are interpolated onto them with a little noise. Extra
+# instruments are seeded geometric random walks named SYN0001, SYN0002, ...
+def generate(rows_factor=1, instruments_factor=1, source=SOURCE_PATH, seed=510):
+    rng = np.random.default_rng(seed)
+    original = pd.read_parquet(source)
+    original_dates = pd.to_datetime(original['Date']).to_numpy('datetime64[ns]').view(np.int64)
+    n = len(original) * int(rows_factor)
+    if rows_factor > 1:
+        dates = np.linspace(original_dates[0], original_dates[-1], n).astype(np.int64)
+    else:
+        dates = original_dates
+
+    columns = {'Date': pa.array(dates.view('datetime64[ns]'))}
+    levels = {}
+    for symbol, column in LEVEL_COLUMNS.items():
+        values = np.interp(dates, original_dates, original[column].to_numpy())
+        if rows_factor > 1:
+            values = values * (1 + rng.normal(0, 0.001, n))
+        levels[symbol] = (column, values)
+    for i in range(1, len(LEVEL_COLUMNS) * (int(instruments_factor) - 1) + 1):
+        steps = rng.normal(0.0002, 0.01, n)
+        levels[f'SYN{i:04d}'] = (f'SYN{i:04d} Price', 100 * np.exp(np.cumsum(steps)))
+
+    for symbol, (column, values) in levels.items():
+        columns[column] = pa.array(values)
+    for symbol, (column, values) in levels.items():
+        returns = np.empty(n)
+        returns[0] = 0.0
+        returns[1:] = (values[1:] / values[:-1] - 1) * 100
+        columns[f'{symbol} Daily Return'] = pa.array(returns)
+    return pa.table(columns)
+
+
+def write(path, rows_factor=1, instruments_factor=1, source=SOURCE_PATH):
+    table = generate(rows_factor, instruments_factor, source)
+    pq.write_table(table, path)
+    return table.num_rows, table.num_columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a scaled-up synthetic final_data.parquet.')
+    parser.add_argument('out')
+    parser.add_argument('--rows', type=int, default=10, help='row multiplier')
+    parser.add_argument('--instruments', type=int, default=1, help='instrument multiplier')
+    parser.add_argument('--source', default=SOURCE_PATH)
+    args = parser.parse_args()
+    rows, columns = write(args.out, args.rows, args.instruments, args.source)
+    print(f'{rows} rows x {columns} columns written to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
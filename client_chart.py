@@ -0,0 +1,137 @@
+import base64
+import json
+import os
+import shutil
+import string
+import uuid
+
+import numpy as np
+import plotly
+from plotly.offline import get_plotlyjs_version
+
+from downsample import downsample_slice
+
+
+# Points per series sent to the browser; zooming in never goes back to the server,
+# so this is the finest detail the browser has
+CLIENT_POINTS = 20000
+PANEL_HEIGHT = 240
+# Room for the title, range selector buttons and range slider
+CHROME_HEIGHT = 190
+# plotly.js as shipped with the installed plotly package, and where Streamlit's static file
+# serving (server.enableStaticServing, see .streamlit/config.toml) publishes it: the
+# static/ folder next to app.py, served at /app/static/
+PLOTLY_BUNDLE = os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js')
+PLOTLY_FILE = f'plotly-{get_plotlyjs_version()}.min.js'
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Only used when static serving is off: the client then needs to reach the CDN
+PLOTLY_CDN = f'https://cdn.plot.ly/{PLOTLY_FILE}'
+
+
+# Little-endian bytes, base64 encoded: decoded into a typed array by the page
+def encode(values, dtype='<f8'):
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
+
+
+# One series as typed arrays: x as float64 epoch milliseconds (what Plotly date axes use),
+# y as float32, which is plenty for drawing and halves the values' payload
+def series_payload(name, slicer, column='value', budget=CLIENT_POINTS):
+    dates, values = downsample_slice(slicer, column, slicer.min_date, slicer.max_date, budget)
+    x = np.asarray(dates).astype('datetime64[ms]').astype(np.float64)
+    return {'name': name, 'x': encode(x), 'y': encode(values, '<f4')}
+
+
+# Copies the bundled plotly.js into the static folder once per plotly version
+def publish_plotly_js(static_dir=STATIC_DIR):
+    target = os.path.join(static_dir, PLOTLY_FILE)
+    if not os.path.exists(target):
+        os.makedirs(static_dir, exist_ok=True)
+        tmp_path = f'{target}.{uuid.uuid4().hex}.tmp'
+        shutil.copyfile(PLOTLY_BUNDLE, tmp_path)
+        os.replace(tmp_path, target)
+    return PLOTLY_FILE
+
+
+# URL of the plotly.js the chart page loads: the bundled copy from the app's own server
+# when static serving is on, so browser mode works offline and under a strict CSP
+def plotly_js_url(static_serving, base_url_path=''):
+    if not static_serving:
+        return PLOTLY_CDN
+    base = base_url_path.strip('/')
+    return f"/{base + '/' if base else ''}app/static/{publish_plotly_js()}"
+
+
+TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="$plotly_js"></script>
+<style>body { margin: 0; font-family: sans-serif; } #range { font-size: 13px; color: #555; margin: 4px 8px; }</style>
+</head>
+<body>
+<div id="range"></div>
+<div id="chart"></div>
+<script>
+const payload = $payload;
+
+function decode(text, type) {
+    const bytes = Uint8Array.from(atob(text), c => c.charCodeAt(0));
+    return new type(bytes.buffer);
+}
+
+// one panel per series, stacked, all on the same date axis so zoom and the range slider are linked
+const n = payload.series.length;
+const gap = 0.04;
+const height = (1 - gap * (n - 1)) / n;
+const traces = [];
+const layout = {
+    title: {text: payload.title},
+    height: $height,
+    margin: {l: 60, r: 20, t: 50, b: 20},
+    showlegend: n > 1,
+    legend: {orientation: 'h', y: 1.08},
+    xaxis: {
+        type: 'date',
+        anchor: 'y' + (n > 1 ? n : ''),
+        rangeslider: {visible: true, thickness: 0.08},
+        rangeselector: {buttons: [
+            {count: 1, label: '1y', step: 'year', stepmode: 'backward'},
+            {count: 5, label: '5y', step: 'year', stepmode: 'backward'},
+            {count: 1, label: 'YTD', step: 'year', stepmode: 'todate'},
+            {step: 'all'}
+        ]}
+    }
+};
+payload.series.forEach((series, i) => {
+    const axis = i === 0 ? '' : String(i + 1);
+    traces.push({
+        type: 'scattergl', mode: 'lines', name: series.name,
+        x: decode(series.x, Float64Array), y: decode(series.y, Float32Array), xaxis: 'x', yaxis: 'y' + axis
+    });
+    const top = 1 - i * (height + gap);
+    layout['yaxis' + axis] = {title: {text: series.name}, domain: [top - height, top]};
+});
+
+const chart = document.getElementById('chart');
+const label = document.getElementById('range');
+function showRange() {
+    const range = chart.layout.xaxis.range;
+    label.textContent = 'Showing ' + String(range[0]).slice(0, 10) + ' to ' + String(range[1]).slice(0, 10);
+}
+Plotly.newPlot(chart, traces, layout, {responsive: true}).then(showRange);
+chart.on('plotly_relayout', showRange);
+</script>
+</body>
+</html>
+""")
+
+
+# Self-contained page: the series are embedded once, every later range change happens in the browser
+def chart_html(title, series, plotly_js=PLOTLY_CDN):
+    # '</' is escaped so a name can never close the script element
+    payload = json.dumps({'title': title, 'series': series}).replace('</', '<\\/')
+    return TEMPLATE.substitute(plotly_js=plotly_js, payload=payload, height=chart_height(len(series)) - 30)
+
+
+def chart_height(count):
+    return CHROME_HEIGHT + PANEL_HEIGHT * count
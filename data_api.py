@@ -0,0 +1,269 @@
+import argparse
+import hashlib
+import io
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from data_store import DATA_PATH, get_store
+from lru import LRUCache
+from slicing import get_slicer
+
+
+DEFAULT_PORT = 8510
+DATE_COLUMN = 'Date'
+# Rows per record batch written to the response
+BATCH_ROWS = 16384
+# Encoded responses kept for repeated polling; larger bodies are only streamed
+CACHE_BYTES = 64 * 1024 * 1024
+MAX_CACHED_BODY = 8 * 1024 * 1024
+
+FORMATS = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'csv': 'text/csv; charset=utf-8',
+    'json': 'application/json',
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# Timestamps as ISO strings for the text formats; whole days are written without a
+# time part, like the Date column of final_data.parquet
+def _text_columns(table):
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            column = table.column(i)
+            daily = pc.all(pc.equal(pc.floor_temporal(column, unit='day'), column)).as_py() is not False
+            text = pc.strftime(column, '%Y-%m-%d' if daily else '%Y-%m-%dT%H:%M:%S')
+            table = table.set_column(i, field.name, text)
+    return table
+
+
+# Collects what a pyarrow writer writes, to hand it out one record batch at a time
+class _Sink(io.RawIOBase):
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def encode_arrow(table):
+    sink = _Sink()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        yield sink.drain()
+        for batch in table.to_batches(max_chunksize=BATCH_ROWS):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def encode_csv(table):
+    table = _text_columns(table)
+    sink = _Sink()
+    with pacsv.CSVWriter(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=BATCH_ROWS):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+# JSON array of row objects; nan values are written as null
+def encode_json(table):
+    table = _text_columns(table)
+    yield b'['
+    first = True
+    for batch in table.to_batches(max_chunksize=BATCH_ROWS):
+        rows = batch.to_pylist()
+        for row in rows:
+            for name, value in row.items():
+                if isinstance(value, float) and math.isnan(value):
+                    row[name] = None
+        if rows:
+            text = json.dumps(rows, separators=(',', ':'))[1:-1]
+            yield (text if first else ',' + text).encode()
+            first = False
+    yield b']'
+
+
+ENCODERS = {'arrow': encode_arrow, 'csv': encode_csv, 'json': encode_json}
+
+
+# Read-only slices of the app's dataset over HTTP.
+#
+# GET /v1/columns also reports the store's resident memory.
+#
+# A request is resolved to (dataset version, columns, row bounds, format) with
+# the same binary-searched date index the app uses, so slicing never copies the
+# table. A hash of that tuple is the ETag: a client polling with If-None-Match gets a 304
+# until the dataset changes. Encoded bodies of hot slices are kept in an LRU;
+# everything else is streamed record batch by record batch.
+class DataAPI:
+
+    def __init__(self, path=DATA_PATH):
+        self.store = get_store(path)
+        self.cache = LRUCache(maxsize=512, maxbytes=CACHE_BYTES, sizeof=lambda entry: len(entry[1]))
+
+    def columns(self):
+        slicer = get_slicer(self.store)
+        return {
+            'version': self.store.version,
+            'rows': len(slicer.dates),
+            'first': str(slicer.min_date.astype('datetime64[D]')),
+            'last': str(slicer.max_date.astype('datetime64[D]')),
+            'columns': slicer.value_columns,
+            'memory': self.store.memory_usage(),
+        }
+
+    # (etag, format, table) of one /v1/series request
+    def resolve(self, query, accept=''):
+        version = self.store.version
+        slicer = get_slicer(self.store)
+        columns = [name for value in query.get('columns', []) for name in value.split(',') if name]
+        columns = columns or slicer.value_columns
+        unknown = [name for name in columns if name not in slicer.value_columns]
+        if unknown:
+            raise BadRequest(f'unknown columns: {", ".join(unknown)}')
+        fmt = query.get('format', [None])[0] or next(
+            (name for name, content_type in FORMATS.items() if content_type.split(';')[0] in accept), 'arrow')
+        if fmt not in FORMATS:
+            raise BadRequest(f'format must be one of {", ".join(FORMATS)}')
+        try:
+            start = np.datetime64(query.get('start', [slicer.min_date])[0], 'ns')
+            end = np.datetime64(query.get('end', [slicer.max_date])[0], 'ns')
+        except ValueError as exc:
+            raise BadRequest(f'bad date: {exc}')
+        if end == end.astype('datetime64[D]'):
+            # a bare end date includes the whole day
+            end = end + np.timedelta64(1, 'D') - np.timedelta64(1, 'ns')
+        lo, hi = slicer.bounds(start, end)
+        digest = hashlib.blake2b(repr((version, columns, lo, hi, fmt)).encode(), digest_size=16)
+        etag = f'"{digest.hexdigest()}"'
+        table = self.store.table().select([DATE_COLUMN] + columns).slice(lo, hi - lo)
+        return etag, fmt, table
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'FinancialDataAPI/1.0'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        api = self.server.api
+        try:
+            if url.path == '/v1/columns':
+                self._send_body(200, 'application/json', json.dumps(api.columns()).encode())
+            elif url.path == '/v1/series':
+                self._series(api, query)
+            else:
+                self._send_error(404, 'not found')
+        except BadRequest as exc:
+            self._send_error(400, str(exc))
+
+    def _series(self, api, query):
+        etag, fmt, table = api.resolve(query, self.headers.get('Accept', ''))
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if _etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        cached = api.cache.get(etag)
+        if cached is not None:
+            self._send_body(200, cached[0], cached[1], headers)
+            return
+
+        # stream with chunked encoding, keeping the body for the cache while it is small
+        self.send_response(200)
+        self.send_header('Content-Type', FORMATS[fmt])
+        self.send_header('Transfer-Encoding', 'chunked')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        body, size = [], 0
+        for chunk in ENCODERS[fmt](table):
+            if not chunk:
+                continue
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            size += len(chunk)
+            if size <= MAX_CACHED_BODY:
+                body.append(chunk)
+        self.wfile.write(b'0\r\n\r\n')
+        if size <= MAX_CACHED_BODY:
+            api.cache.put(etag, (FORMATS[fmt], b''.join(body)))
+
+    def _send_body(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_body(status, 'application/json', json.dumps({'error': message}).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=DEFAULT_PORT, path=DATA_PATH):
+    server = ThreadingHTTPServer((host, port), APIHandler)
+    server.daemon_threads = True
+    server.api = DataAPI(path)
+    return server
+
+
+# Serve on a daemon thread, e.g. next to the Streamlit app or in tests
+def serve_in_background(host='127.0.0.1', port=0, path=DATA_PATH):
+    server = make_server(host, port, path)
+    threading.Thread(target=server.serve_forever, name='data-api', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Read-only HTTP API serving slices of final_data.parquet '
+                                                 'as Arrow IPC, CSV or JSON.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--data', default=DATA_PATH)
+    args = parser.parse_args()
+    server = make_server(args.host, args.port, args.data)
+    print(f'serving {args.data} on http://{args.host}:{server.server_address[1]}/v1/series')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from tracing import traced
+
+
+DATA_PATH = 'final_data.parquet'
+
+# Block size used when hashing the parquet file contents
+_HASH_BLOCK = 1 << 20
+
+
+# Content hash of a file, read through a memory map so no extra copy is made
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with pa.memory_map(path, 'r') as source:
+        while True:
+            block = source.read_buffer(_HASH_BLOCK)
+            if block.size == 0:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Objects derived from an immutable source (slicers, pagers, caches, ...), each built
+# once per key by the first caller; concurrent callers wait for that build instead of
+# repeating it. Builds of different names do not block each other, so a factory may
+# itself ask for another derived object.
+class DerivedObjects:
+
+    def __init__(self):
+        self._derived = {}
+        self._derived_locks = {}
+        self._derived_guard = threading.Lock()
+
+    # Key the derived objects are valid for; they are rebuilt when it changes
+    def derived_key(self):
+        return None
+
+    def derived(self, name, factory):
+        key = self.derived_key()
+        entry = self._derived.get(name)
+        if entry is None or entry[0] != key:
+            with self._derived_guard:
+                lock = self._derived_locks.setdefault(name, threading.Lock())
+            with lock:
+                entry = self._derived.get(name)
+                if entry is None or entry[0] != key:
+                    entry = (key, factory())
+                    self._derived[name] = entry
+        return entry[1]
+
+
+# Process-wide, read-only view of one parquet file.
+#
+# The file is opened as a memory map and decoded into Arrow once per version.
+# Every page and session gets the same Arrow table and the same pandas frame,
+# so nothing is re-read, re-hashed or copied per rerun. A reload only happens
+# when the file's mtime/size changes AND its content hash differs.
+#
+# Everything derived from the table (slicer, pager, rollups, series store) is
+# kept with store.derived(name, factory) and rebuilt on the first use after a reload.
+class DatasetStore(DerivedObjects):
+
+    def __init__(self, path=DATA_PATH):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._stat = None
+        self._version = None
+        self._table = None
+        self._frame = None
+        self._file_size = 0
+
+    # Stat fingerprint used to decide whether the hash needs to be recomputed
+    def _fingerprint(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @traced('parquet.read_dataset')
+    def _load(self, version):
+        with pa.memory_map(self.path, 'r') as source:
+            table = pq.read_table(source, memory_map=True)
+        # Parse the ISO date strings once, in Arrow, instead of on every frame() call
+        # (pandas 3 writes them as large_string)
+        date_type = table.schema.field('Date').type
+        if pa.types.is_string(date_type) or pa.types.is_large_string(date_type):
+            dates = pc.cast(table['Date'], pa.timestamp('ns'))
+            table = table.set_column(table.schema.get_field_index('Date'), 'Date', dates)
+        self._table = table
+        self._frame = None
+        self._version = version
+        self._file_size = os.path.getsize(self.path)
+
+    # Reload the table if the file on disk has changed since the last check
+    def refresh(self):
+        fingerprint = self._fingerprint()
+        if fingerprint == self._stat and self._table is not None:
+            return self._version
+        with self._lock:
+            if fingerprint == self._stat and self._table is not None:
+                return self._version
+            version = file_digest(self.path)
+            if version != self._version or self._table is None:
+                self._load(version)
+            self._stat = fingerprint
+        return self._version
+
+    @property
+    def version(self):
+        return self.refresh()
+
+    def derived_key(self):
+        return self.version
+
+    # Shared Arrow table; slicing it is zero-copy
+    def table(self):
+        self.refresh()
+        return self._table
+
+    # Shared pandas view of the table. Float columns without nulls are
+    # converted zero-copy; callers must treat the frame as read-only.
+    def frame(self):
+        self.refresh()
+        frame = self._frame
+        if frame is None:
+            with self._lock:
+                if self._frame is None:
+                    self._frame = self._table.to_pandas(split_blocks=True, self_destruct=False)
+                frame = self._frame
+        return frame
+
+    # Resident memory of this store and of the whole Arrow pool, in bytes
+    def memory_usage(self):
+        self.refresh()
+        frame = self._frame
+        return {
+            'version': self._version,
+            'rows': self._table.num_rows,
+            'file_bytes': self._file_size,
+            'arrow_bytes': self._table.nbytes,
+            'pandas_bytes': int(frame.memory_usage(index=True, deep=False).sum()) if frame is not None else 0,
+            'arrow_pool_bytes': pa.total_allocated_bytes(),
+        }
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+# One store per absolute path, shared by every Streamlit session in the process
+def get_store(path=DATA_PATH):
+    key = os.path.abspath(path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = DatasetStore(key)
+                _stores[key] = store
+    return store
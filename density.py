@@ -0,0 +1,150 @@
+import io
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image
+
+from lru import LRUCache
+
+
+# Output grid (width, height) in pixels; the rendering cost depends on these, not on the point count
+RESOLUTIONS = {
+    'Low': (320, 200),
+    'Medium': (640, 400),
+    'High': (1280, 800),
+}
+DEFAULT_RESOLUTION = 'Medium'
+# One colour per series, the matplotlib defaults of the original static charts
+COLORS = [(31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40)]
+# Opacity of a cell holding a single point; denser cells go up to fully opaque
+MIN_ALPHA = 0.5
+# Grid width per pixel of spreading, so isolated points stay visible at high resolutions
+SPREAD_WIDTH = 640
+DATE_COLUMN = 'Date'
+CACHE_BYTES = 64 * 1024 * 1024
+
+# counts: one (height, width) grid per y column; row 0 is the lowest y bin
+Aggregate = namedtuple('Aggregate', ['counts', 'x_range', 'y_range'])
+Rendered = namedtuple('Rendered', ['png', 'x_range', 'y_range'])
+
+
+# (low, high) of the finite values, widened when every value is the same
+def value_range(*arrays):
+    finite = [a[np.isfinite(a)] for a in arrays]
+    finite = [a for a in finite if len(a)]
+    if not finite:
+        return 0.0, 1.0
+    low = float(min(a.min() for a in finite))
+    high = float(max(a.max() for a in finite))
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return low, high
+
+
+# Cell index of every value along one axis, with the upper edge folded into the last cell
+def _cells(values, low, high, size):
+    cells = ((values - low) * (size / (high - low))).astype(np.intp)
+    return np.clip(cells, 0, size - 1)
+
+
+# Vectorized 2D histogram: points per (row, column) cell in a single bincount
+def bin2d(x, y, width, height, x_range, y_range):
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    cells = _cells(y, *y_range, height) * width + _cells(x, *x_range, width)
+    return np.bincount(cells, minlength=width * height).reshape(height, width)
+
+
+# Counts -> straight-alpha RGBA pixels of one colour, opacity growing with log density
+def shade(counts, color):
+    rgba = np.zeros(counts.shape + (4,), dtype=np.float64)
+    rgba[..., :3] = np.asarray(color, dtype=np.float64) / 255
+    peak = counts.max()
+    if peak > 0:
+        scaled = np.log1p(counts) / np.log1p(peak)
+        rgba[..., 3] = np.where(counts > 0, MIN_ALPHA + (1 - MIN_ALPHA) * scaled, 0.0)
+    return rgba
+
+
+# Grows every shaded cell into a (2 * radius + 1) square: a max filter over shifted copies
+def spread(rgba, radius):
+    if radius < 1:
+        return rgba
+    alpha = rgba[..., 3]
+    height, width = alpha.shape
+    padded = np.pad(alpha, radius)
+    grown = alpha.copy()
+    for dy in range(2 * radius + 1):
+        for dx in range(2 * radius + 1):
+            np.maximum(grown, padded[dy:dy + height, dx:dx + width], out=grown)
+    out = rgba.copy()
+    out[..., 3] = grown
+    return out
+
+
+# Porter-Duff 'over' of straight-alpha layers, later layers on top
+def composite(layers):
+    out = np.zeros_like(layers[0])
+    for layer in layers:
+        alpha = layer[..., 3:]
+        below = out[..., 3:] * (1 - alpha)
+        total = alpha + below
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[..., :3] = np.where(total > 0, (layer[..., :3] * alpha + out[..., :3] * below) / total, 0.0)
+        out[..., 3:] = total
+    return out
+
+
+def to_png(rgba):
+    # image rows run top to bottom, the grid's rows bottom to top
+    pixels = np.ascontiguousarray((rgba[::-1] * 255).round().astype(np.uint8))
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, 'RGBA').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _nbytes(value):
+    if isinstance(value, Rendered):
+        return len(value.png)
+    return sum(counts.nbytes for counts in value.counts)
+
+
+def _cache(slicer):
+    return slicer.derived('density', lambda: LRUCache(maxsize=256, maxbytes=CACHE_BYTES, sizeof=_nbytes))
+
+
+# x values of a range as floats; the date index becomes epoch nanoseconds
+def _x_values(slicer, x_column, lo, hi):
+    if x_column == DATE_COLUMN:
+        return slicer.dates[lo:hi].view(np.int64).astype(np.float64)
+    return np.asarray(slicer.column(x_column)[lo:hi], dtype=np.float64)
+
+
+# Density grids of y_columns against x_column over [start, end], cached per (columns, range, resolution)
+def aggregate(slicer, x_column, y_columns, start, end, resolution=DEFAULT_RESOLUTION):
+    lo, hi = slicer.bounds(start, end)
+    key = ('aggregate', x_column, tuple(y_columns), lo, hi, resolution)
+
+    def compute():
+        width, height = RESOLUTIONS[resolution]
+        x = _x_values(slicer, x_column, lo, hi)
+        ys = [np.asarray(slicer.column(column)[lo:hi], dtype=np.float64) for column in y_columns]
+        x_range, y_range = value_range(x), value_range(*ys)
+        counts = [bin2d(x, y, width, height, x_range, y_range) for y in ys]
+        return Aggregate(counts, x_range, y_range)
+
+    return _cache(slicer).get_or_compute(key, compute)
+
+
+# PNG density image of y_columns against x_column, cached per (columns, range, resolution)
+def render(slicer, x_column, y_columns, start, end, resolution=DEFAULT_RESOLUTION):
+    lo, hi = slicer.bounds(start, end)
+    key = ('render', x_column, tuple(y_columns), lo, hi, resolution)
+
+    def compute():
+        grids = aggregate(slicer, x_column, y_columns, start, end, resolution)
+        radius = max(1, round(RESOLUTIONS[resolution][0] / SPREAD_WIDTH))
+        layers = [spread(shade(counts, COLORS[i % len(COLORS)]), radius) for i, counts in enumerate(grids.counts)]
+        return Rendered(to_png(composite(layers)), grids.x_range, grids.y_range)
+
+    return _cache(slicer).get_or_compute(key, compute)
@@ -0,0 +1,97 @@
+from collections import namedtuple
+
+import numpy as np
+import pyarrow as pa
+
+from lru import LRUCache
+from slicing import DateSlicer
+
+
+TRADING_DAYS = 252
+# Memory budget for memoized derived series
+CACHE_BYTES = 64 * 1024 * 1024
+
+# A derived metric: compute(values, **params) -> array aligned with values
+Metric = namedtuple('Metric', ['name', 'compute', 'params'])
+
+REGISTRY = {}
+
+
+# Register a derived metric under a display name, with its default parameters
+def register(name, **params):
+    def decorator(compute):
+        REGISTRY[name] = Metric(name, compute, params)
+        return compute
+    return decorator
+
+
+# Rolling mean and standard deviation from prefix sums; the first window - 1 values are nan
+def _rolling_moments(values, window):
+    window = int(window)
+    out_mean = np.full(len(values), np.nan)
+    out_std = np.full(len(values), np.nan)
+    if window < 2 or len(values) < window:
+        return out_mean, out_std
+    shifted = values - values[0]  # keeps the sums of squares well conditioned
+    csum = np.concatenate(([0.0], np.cumsum(shifted)))
+    csq = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    total = csum[window:] - csum[:-window]
+    total_sq = csq[window:] - csq[:-window]
+    mean = total / window
+    variance = np.maximum(total_sq - total * mean, 0.0) / (window - 1)
+    out_mean[window - 1:] = mean + values[0]
+    out_std[window - 1:] = np.sqrt(variance)
+    return out_mean, out_std
+
+
+def _log_returns(values):
+    out = np.full(len(values), np.nan)
+    out[1:] = np.log(values[1:] / values[:-1]) * 100
+    return out
+
+
+@register('Log Return')
+def log_return(values):
+    return _log_returns(values)
+
+
+@register('Rolling Volatility', window=21)
+def rolling_volatility(values, window):
+    returns = _log_returns(values)
+    _, std = _rolling_moments(np.nan_to_num(returns[1:]), window)
+    return np.concatenate(([np.nan], std * np.sqrt(TRADING_DAYS)))
+
+
+@register('Rolling Z-Score', window=63)
+def rolling_zscore(values, window):
+    mean, std = _rolling_moments(values, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (values - mean) / std
+
+
+@register('Drawdown')
+def drawdown(values):
+    return (values / np.maximum.accumulate(values) - 1) * 100
+
+
+@register('Cumulative Return')
+def cumulative_return(values):
+    return (values / values[0] - 1) * 100
+
+
+# Derived series are computed on demand and kept per (series, metric, params) under a byte budget
+_cache = LRUCache(maxsize=1024, maxbytes=CACHE_BYTES, sizeof=lambda slicer: slicer.column('value').nbytes)
+
+
+# DateSlicer over a derived metric of a store series
+def derived_slicer(series_store, symbol, base_metric, name, **params):
+    metric = REGISTRY[name]
+    params = {**metric.params, **params}
+    key = (series_store.version, symbol, base_metric, name, tuple(sorted(params.items())))
+
+    def compute():
+        base = series_store.slicer(symbol, base_metric)
+        values = metric.compute(np.asarray(base.column('value'), dtype=np.float64), **params)
+        return DateSlicer(pa.table({'Date': pa.array(base.dates), 'value': pa.array(values)}))
+
+    return _cache.get_or_compute(key, compute)
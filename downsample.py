@@ -0,0 +1,111 @@
+import numpy as np
+
+from lru import LRUCache
+
+
+DEFAULT_BUDGET = 1000
+METHODS = ['LTTB', 'Min/Max']
+# Smallest budgets the methods can honour: LTTB keeps both endpoints and one point per
+# bucket, Min/Max both endpoints and the low and high of one bucket
+LTTB_MIN_POINTS = 3
+MINMAX_MIN_POINTS = 4
+
+
+# Dates become float offsets from the first point so the area/bucket maths stays precise
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').view(np.int64)
+        return (x - x[0]).astype(np.float64)
+    return x.astype(np.float64, copy=False)
+
+
+# Largest-Triangle-Three-Buckets: indices of at most n_out points that keep the visual shape.
+# Bucket means come from prefix sums; each bucket's triangle areas are computed in one
+# vectorized step, so the only Python loop is over the (small) output budget.
+def lttb_indices(x, y, n_out):
+    n = len(y)
+    n_out = max(int(n_out), LTTB_MIN_POINTS)
+    if n_out >= n:
+        return np.arange(n)
+    xf = _as_float(x)
+    yf = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    csx = np.concatenate(([0.0], np.cumsum(xf)))
+    csy = np.concatenate(([0.0], np.cumsum(yf)))
+
+    # mean of the bucket following each bucket (the last one points at the final sample)
+    next_lo = np.append(edges[1:-1], n - 1)
+    next_hi = np.append(edges[2:], n)
+    counts = next_hi - next_lo
+    mean_x = (csx[next_hi] - csx[next_lo]) / counts
+    mean_y = (csy[next_hi] - csy[next_lo]) / counts
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        xa, ya = xf[a], yf[a]
+        area = np.abs((xa - mean_x[b]) * (yf[lo:hi] - ya) - (xa - xf[lo:hi]) * (mean_y[b] - ya))
+        a = lo + int(np.argmax(area))
+        out[b + 1] = a
+    return out
+
+
+# Per-pixel min/max bucketing: the x range is split into (n_out - 2) // 2 equal-width buckets and
+# the minimum and maximum sample of every bucket (plus both endpoints) is kept, so no extreme is ever dropped.
+def minmax_indices(x, y, n_out):
+    n = len(y)
+    n_out = max(int(n_out), MINMAX_MIN_POINTS)
+    n_buckets = (n_out - 2) // 2
+    if n <= n_out:
+        return np.arange(n)
+    xf = _as_float(x)
+    yf = np.asarray(y, dtype=np.float64)
+    span = xf[-1] - xf[0]
+    if span <= 0:
+        bucket = (np.arange(n) * n_buckets) // n
+    else:
+        bucket = np.minimum(((xf - xf[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    seg = np.repeat(np.arange(len(starts)), counts)
+
+    lows = np.repeat(np.minimum.reduceat(yf, starts), counts)
+    highs = np.repeat(np.maximum.reduceat(yf, starts), counts)
+    # first position in each segment equal to its min / max
+    is_low = yf == lows
+    is_high = yf == highs
+    low_idx = np.flatnonzero(is_low)[np.unique(seg[is_low], return_index=True)[1]]
+    high_idx = np.flatnonzero(is_high)[np.unique(seg[is_high], return_index=True)[1]]
+    return np.unique(np.concatenate(([0, n - 1], low_idx, high_idx)))
+
+
+def downsample(x, y, budget=DEFAULT_BUDGET, method='LTTB'):
+    y = np.asarray(y)
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = np.asarray(x)[finite], y[finite]
+    if method == 'LTTB':
+        idx = lttb_indices(x, y, budget)
+    elif method == 'Min/Max':
+        idx = minmax_indices(x, y, budget)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    if len(idx) == len(y):
+        return x, y
+    return np.asarray(x)[idx], y[idx]
+
+
+# Downsampled (dates, values) for a slicer range, cached per (column, range, budget, method)
+def downsample_slice(slicer, column, start, end, budget=DEFAULT_BUDGET, method='LTTB'):
+    cache = slicer.derived('downsample', lambda: LRUCache(maxsize=128))
+    key = (column, np.datetime64(start, 'ns'), np.datetime64(end, 'ns'), int(budget), method)
+
+    def compute():
+        series = slicer.slice(column, start, end)
+        return downsample(series.dates, series.values, budget, method)
+
+    return cache.get_or_compute(key, compute)
@@ -0,0 +1,293 @@
+import argparse
+import datetime
+import functools
+import http.server
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from data_store import DATA_PATH
+
+
+DATASET_DIR = 'data'
+
+# Source endpoints; point them at a local fixture server to run offline
+GOLD_URL = 'https://sdbullion.com/gold-prices-{}'
+ALPHAVANTAGE_URL = 'https://www.alphavantage.co/query'
+YAHOO_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{}'
+
+SP500_SYMBOL = 'SPX'
+TEN_YEAR_SYMBOL = '^TNX'
+
+# Column written to final_data.parquet for each source, in file order
+SOURCES = {
+    'sp500': 'SP500 Price',
+    'gold': 'Gold Price',
+    'ten_year': '10 Year T Note Yield',
+}
+RETURN_COLUMNS = {
+    'sp500': 'SP500 Daily Return',
+    'gold': 'Gold Daily Return',
+    'ten_year': '10 Year T Note Daily Return',
+}
+
+# The sdbullion pages changed their date format from year to year
+DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%d-%b-%Y', '%d-%b-%y', '%b %d, %Y', '%B %d, %Y',
+                '%d %b %Y', '%d %B %Y', '%Y/%m/%d']
+
+MAX_WORKERS = 4
+RETRIES = 5
+BACKOFF = 0.5
+TIMEOUT = 30
+
+
+# Pooled HTTP session with retry and exponential backoff on throttling and server errors
+def make_session(pool_size=MAX_WORKERS, retries=RETRIES, backoff=BACKOFF):
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET']), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# GET a URL and return the body; optionally save it under record_dir as a fixture
+def fetch(session, url, params=None, record_dir=None):
+    response = session.get(url, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    if record_dir is not None:
+        path = os.path.join(record_dir, urlsplit(url).path.lstrip('/'))
+        os.makedirs(os.path.dirname(path) or record_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(response.content)
+    return response.text
+
+
+# Vectorized date parsing: each format is tried once over all still-unparsed strings
+def parse_dates(values, formats=DATE_FORMATS):
+    values = pd.Series(values, dtype='string').str.strip()
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    for fmt in formats:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=fmt, errors='coerce')
+    return parsed
+
+
+def _to_float(values):
+    values = pd.Series(values, dtype='string').str.replace(r'[$,\s]', '', regex=True)
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+# Daily gold prices from one sdbullion yearly page
+def parse_gold_page(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    dates, prices = [], []
+    for row in soup.find_all('tr'):
+        cells = [cell.get_text(strip=True) for cell in row.find_all('td')]
+        if len(cells) >= 2:
+            dates.append(cells[0])
+            prices.append(cells[1])
+    frame = pd.DataFrame({'Date': parse_dates(dates), 'value': _to_float(prices)})
+    return frame.dropna()
+
+
+# Daily closes from an AlphaVantage TIME_SERIES_DAILY response
+def parse_alphavantage(text):
+    payload = json.loads(text)
+    series = payload.get('Time Series (Daily)')
+    if series is None:
+        raise ValueError(payload.get('Note') or payload.get('Error Message') or 'Unexpected AlphaVantage response')
+    dates = np.fromiter(series.keys(), dtype=object, count=len(series))
+    closes = [row['4. close'] for row in series.values()]
+    return pd.DataFrame({'Date': parse_dates(dates), 'value': _to_float(closes)}).dropna()
+
+
+# Daily closes from a Yahoo Finance chart response (the endpoint yfinance wraps)
+def parse_yahoo_chart(text):
+    result = json.loads(text)['chart']['result'][0]
+    timestamps = np.asarray(result.get('timestamp', []), dtype='int64')
+    closes = np.asarray(result['indicators']['quote'][0].get('close', []), dtype='float64')
+    dates = pd.to_datetime(timestamps, unit='s').normalize().astype('datetime64[ns]')
+    return pd.DataFrame({'Date': dates, 'value': closes}).dropna()
+
+
+def fetch_gold(session, start, end, record_dir=None):
+    years = range(start.year, end.year + 1)
+    return [(functools.partial(fetch, session, GOLD_URL.format(year), record_dir=record_dir), parse_gold_page)
+            for year in years]
+
+
+def fetch_sp500(session, start, end, apikey=None, record_dir=None):
+    params = {'function': 'TIME_SERIES_DAILY', 'symbol': SP500_SYMBOL, 'outputsize': 'full',
+              'apikey': apikey or os.environ.get('ALPHAVANTAGE_API_KEY', 'demo')}
+    return [(functools.partial(fetch, session, ALPHAVANTAGE_URL, params, record_dir), parse_alphavantage)]
+
+
+def fetch_ten_year(session, start, end, record_dir=None):
+    params = {
+        'period1': int(pd.Timestamp(start).timestamp()),
+        'period2': int((pd.Timestamp(end) + pd.Timedelta(days=1)).timestamp()),
+        'interval': '1d',
+    }
+    url = YAHOO_CHART_URL.format(TEN_YEAR_SYMBOL)
+    return [(functools.partial(fetch, session, url, params, record_dir), parse_yahoo_chart)]
+
+
+FETCHERS = {
+    'sp500': fetch_sp500,
+    'gold': fetch_gold,
+    'ten_year': fetch_ten_year,
+}
+
+
+def _dataset(directory):
+    return ds.dataset(directory, format='parquet', partitioning='hive')
+
+
+# First and last stored date of a source, or None when nothing has been ingested yet
+def stored_range(dataset_dir, source):
+    directory = os.path.join(dataset_dir, source)
+    if not os.path.isdir(directory):
+        return None
+    dates = _dataset(directory).to_table(columns=['Date'])['Date']
+    if len(dates) == 0:
+        return None
+    bounds = pc.min_max(dates).as_py()
+    return bounds['min'].date(), bounds['max'].date()
+
+
+# Date ranges in [start, end] not covered by the stored data of a source
+def missing_ranges(dataset_dir, source, start, end):
+    stored = stored_range(dataset_dir, source)
+    if stored is None:
+        return [(start, end)]
+    day = datetime.timedelta(days=1)
+    ranges = []
+    if start < stored[0]:
+        ranges.append((start, min(end, stored[0] - day)))
+    if end > stored[1]:
+        ranges.append((max(start, stored[1] + day), end))
+    return ranges
+
+
+# Append rows to a source's year-partitioned dataset without touching existing files
+def append_rows(dataset_dir, source, frame):
+    if frame.empty:
+        return 0
+    frame = frame.assign(year=frame['Date'].dt.year.astype('int32'))
+    table = pa.Table.from_pandas(frame[['Date', 'value', 'year']], preserve_index=False)
+    ds.write_dataset(table, os.path.join(dataset_dir, source), format='parquet', partitioning=['year'],
+                     partitioning_flavor='hive', existing_data_behavior='overwrite_or_ignore',
+                     basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet')
+    return len(frame)
+
+
+# Fetch every missing range of every source concurrently and append the new rows.
+# Returns the number of rows added per source.
+def ingest(start, end, dataset_dir=DATASET_DIR, sources=None, apikey=None, max_workers=MAX_WORKERS,
+           record_dir=None):
+    sources = sources or list(FETCHERS)
+    session = make_session(pool_size=max_workers)
+    jobs = []
+    for source in sources:
+        for lo, hi in missing_ranges(dataset_dir, source, start, end):
+            kwargs = {'record_dir': record_dir}
+            if source == 'sp500':
+                kwargs['apikey'] = apikey
+            for request, parse in FETCHERS[source](session, lo, hi, **kwargs):
+                jobs.append((source, lo, hi, request, parse))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [(source, lo, hi, parse, pool.submit(request)) for source, lo, hi, request, parse in jobs]
+        frames = {source: [] for source in sources}
+        for source, lo, hi, parse, future in futures:
+            frame = parse(future.result())
+            dates = frame['Date']
+            frames[source].append(frame[(dates >= pd.Timestamp(lo)) & (dates <= pd.Timestamp(hi))])
+
+    added = {}
+    for source, parts in frames.items():
+        new = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['Date', 'value'])
+        new = new.drop_duplicates('Date').sort_values('Date')
+        added[source] = append_rows(dataset_dir, source, new)
+    return added
+
+
+# Rebuild final_data.parquet (same schema as before) from the ingested sources.
+# Daily returns are computed per source before the join, then only common dates are kept.
+def build_final(dataset_dir=DATASET_DIR, out_path=DATA_PATH):
+    merged = None
+    for source, column in SOURCES.items():
+        frame = _dataset(os.path.join(dataset_dir, source)).to_table(columns=['Date', 'value']).to_pandas()
+        frame = frame.drop_duplicates('Date').sort_values('Date')
+        frame = frame.rename(columns={'value': column})
+        frame[RETURN_COLUMNS[source]] = frame[column].pct_change() * 100
+        merged = frame if merged is None else merged.merge(frame, on='Date', how='inner')
+    merged = merged.dropna().reset_index(drop=True)
+    merged['Date'] = merged['Date'].dt.strftime('%Y-%m-%d')
+    merged = merged[['Date'] + list(SOURCES.values()) + list(RETURN_COLUMNS.values())]
+    # write beside the target and swap in, so readers never see a half-written file
+    tmp_path = f'{out_path}.{uuid.uuid4().hex}.tmp'
+    merged.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, out_path)
+    return len(merged)
+
+
+# Serve recorded responses from a directory on localhost (query strings are ignored)
+def serve_fixtures(directory, port=0):
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Point every source at a base URL, e.g. one returned by serve_fixtures()
+def use_base_url(base_url):
+    global GOLD_URL, ALPHAVANTAGE_URL, YAHOO_CHART_URL
+    base_url = base_url.rstrip('/')
+    GOLD_URL = base_url + '/gold-prices-{}'
+    ALPHAVANTAGE_URL = base_url + '/query'
+    YAHOO_CHART_URL = base_url + '/v8/finance/chart/{}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch missing gold, S&P 500 and 10Y data and rebuild '
+                                                 'final_data.parquet.')
+    parser.add_argument('--start', type=datetime.date.fromisoformat, default=datetime.date(2001, 1, 1))
+    parser.add_argument('--end', type=datetime.date.fromisoformat, default=datetime.date.today())
+    parser.add_argument('--dataset-dir', default=DATASET_DIR)
+    parser.add_argument('--out', default=DATA_PATH)
+    parser.add_argument('--apikey', help='AlphaVantage key (defaults to $ALPHAVANTAGE_API_KEY)')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--fixtures', help='serve recorded responses from this directory instead of the network')
+    parser.add_argument('--record', help='save every raw response under this directory')
+    args = parser.parse_args()
+
+    if args.fixtures:
+        server = serve_fixtures(args.fixtures)
+        use_base_url(f'http://127.0.0.1:{server.server_address[1]}')
+    added = ingest(args.start, args.end, args.dataset_dir, apikey=args.apikey, max_workers=args.workers,
+                   record_dir=args.record)
+    for source, count in added.items():
+        print(f'{source}: {count} new rows')
+    print(f'{build_final(args.dataset_dir, args.out)} rows written to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+
+
+# Small thread-safe LRU map shared by the slicing, statistics and API caches.
+# Entries are evicted once either maxsize entries or maxbytes (as measured by
+# sizeof) is exceeded.
+class LRUCache:
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.currbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.currbytes -= self.sizeof(self._data.pop(key))
+            self._data[key] = value
+            self.currbytes += size
+            while self._data and (len(self._data) > self.maxsize or
+                                  (self.maxbytes is not None and self.currbytes > self.maxbytes)):
+                _, evicted = self._data.popitem(last=False)
+                self.currbytes -= self.sizeof(evicted)
+
+    # Return the cached value for key, computing and storing it on a miss
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.currbytes = 0
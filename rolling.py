@@ -0,0 +1,401 @@
+import glob
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scheduler import get_scheduler
+from slicing import get_slicer
+
+
+DEFAULT_WINDOW = 250
+DEFAULT_STEP = 5
+METADATA_KEY = b'rolling'
+# Sidecar files kept next to the dataset, one per (window, step)
+MAX_SIDECARS = 8
+
+
+# Kendall's tau-b over a sliding window, updated incrementally.
+# Adding or dropping points only changes their pairs with the rest of the window,
+# so a step of s observations costs one O(s * w) vectorized comparison instead of
+# an O(w log w) recount of the whole window.
+class RollingKendall:
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.lo = self.hi = 0
+        self.score = 0
+        self.ties_x = 0
+        self.ties_y = 0
+
+    # Concordance of the points in [b_lo, b_hi) with the points of [lo, hi) that lie
+    # before them (entering) or after them (leaving), summed over the block
+    def _pairs(self, b_lo, b_hi, lo, hi, before):
+        block = np.arange(b_lo, b_hi)
+        others = np.arange(lo, hi)
+        mask = others[None, :] < block[:, None] if before else others[None, :] > block[:, None]
+        dx = np.sign(self.x[lo:hi][None, :] - self.x[b_lo:b_hi][:, None])
+        dy = np.sign(self.y[lo:hi][None, :] - self.y[b_lo:b_hi][:, None])
+        return (int(np.sum(dx * dy, where=mask)), int(np.count_nonzero((dx == 0) & mask)),
+                int(np.count_nonzero((dy == 0) & mask)))
+
+    # Slide the window to [lo, hi)
+    def move(self, lo, hi):
+        if lo >= self.hi:
+            self.lo = self.hi = lo
+            self.score = self.ties_x = self.ties_y = 0
+        if hi > self.hi:
+            score, tx, ty = self._pairs(self.hi, hi, self.lo, hi, before=True)
+            self.score += score
+            self.ties_x += tx
+            self.ties_y += ty
+            self.hi = hi
+        if lo > self.lo:
+            score, tx, ty = self._pairs(self.lo, lo, self.lo, self.hi, before=False)
+            self.score -= score
+            self.ties_x -= tx
+            self.ties_y -= ty
+            self.lo = lo
+
+    def value(self):
+        n = self.hi - self.lo
+        total = n * (n - 1) // 2
+        denominator = np.sqrt(float(total - self.ties_x) * float(total - self.ties_y))
+        return self.score / denominator if denominator > 0 else np.nan
+
+
+# Spearman's rho over a sliding window. The sorted window is maintained with
+# batched binary-search inserts and deletes, and average ranks are read back from it
+# with searchsorted, so the window never has to be re-sorted from scratch.
+class RollingSpearman:
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.lo = self.hi = 0
+        self.sorted_x = np.empty(0)
+        self.sorted_y = np.empty(0)
+
+    @staticmethod
+    def _insert(values, new):
+        new = np.sort(new)
+        return np.insert(values, np.searchsorted(values, new), new)
+
+    @staticmethod
+    def _delete(values, old):
+        old = np.sort(old)
+        # repeated values must hit consecutive positions of their run in the sorted window
+        offset = np.arange(len(old)) - np.searchsorted(old, old)
+        return np.delete(values, np.searchsorted(values, old) + offset)
+
+    def move(self, lo, hi):
+        if lo >= self.hi or hi - self.hi >= hi - lo:
+            self.sorted_x = np.sort(self.x[lo:hi])
+            self.sorted_y = np.sort(self.y[lo:hi])
+        else:
+            self.sorted_x = self._delete(self._insert(self.sorted_x, self.x[self.hi:hi]), self.x[self.lo:lo])
+            self.sorted_y = self._delete(self._insert(self.sorted_y, self.y[self.hi:hi]), self.y[self.lo:lo])
+        self.lo, self.hi = lo, hi
+
+    @staticmethod
+    def _ranks(sorted_values, values):
+        left = np.searchsorted(sorted_values, values, side='left')
+        right = np.searchsorted(sorted_values, values, side='right')
+        return (left + right + 1) / 2.0
+
+    def value(self):
+        if self.hi - self.lo < 2:
+            return np.nan
+        rank_x = self._ranks(self.sorted_x, self.x[self.lo:self.hi])
+        rank_y = self._ranks(self.sorted_y, self.y[self.lo:self.hi])
+        return np.corrcoef(rank_x, rank_y)[0, 1]
+
+
+# Johansen trace statistics over a sliding window.
+#
+# The VECM regressions (dY_t and Y_{t-1} on the lagged differences and a constant)
+# only need the cross-product moments of the stacked regressors, so moving the
+# window adds the entering rows' outer products and subtracts the leaving ones.
+# Each window then costs one small eigenproblem instead of fresh regressions.
+class RollingJohansen:
+
+    def __init__(self, levels, k_ar_diff=1):
+        self.k = levels.shape[1]
+        self.lags = k_ar_diff
+        diffs = np.diff(levels, axis=0)
+        start = k_ar_diff + 1
+        rows = [diffs[start - 1:], levels[start - 1:-1]]
+        rows += [diffs[start - 1 - lag:len(diffs) - lag] for lag in range(1, k_ar_diff + 1)]
+        rows.append(np.ones((len(levels) - start, 1)))
+        # row r corresponds to observation t = r + start of the level series
+        self.z = np.hstack(rows)
+        self.start = start
+        self.lo = self.hi = 0
+        self.moments = np.zeros((self.z.shape[1], self.z.shape[1]))
+
+    def move(self, lo, hi):
+        # lo/hi are observation positions; convert to regression rows
+        lo = max(lo + self.start, self.start) - self.start
+        hi = max(hi - self.start, lo)
+        if lo >= self.hi or hi - self.hi > hi - lo:
+            block = self.z[lo:hi]
+            self.moments = block.T @ block
+        else:
+            entering = self.z[self.hi:hi]
+            leaving = self.z[self.lo:lo]
+            self.moments += entering.T @ entering - leaving.T @ leaving
+        self.lo, self.hi = lo, hi
+
+    def value(self):
+        n = self.hi - self.lo
+        k = self.k
+        if n <= self.z.shape[1]:
+            return np.full(k, np.nan)
+        m = self.moments / n
+        y0, y1, x = slice(0, k), slice(k, 2 * k), slice(2 * k, None)
+        try:
+            m_xx = np.linalg.inv(m[x, x])
+
+            def s(a, b):
+                return m[a, b] - m[a, x] @ m_xx @ m[x, b]
+
+            s00, s01, s11 = s(y0, y0), s(y0, y1), s(y1, y1)
+            product = np.linalg.solve(s11, s01.T @ np.linalg.solve(s00, s01))
+        except np.linalg.LinAlgError:
+            return np.full(k, np.nan)
+        eigenvalues = np.sort(np.clip(np.linalg.eigvals(product).real, 0.0, 1.0 - 1e-12))[::-1]
+        return -n * np.cumsum(np.log(1.0 - eigenvalues)[::-1])[::-1]
+
+
+# Evaluate a contiguous run of windows (given by their end positions) in one process,
+# sliding the incremental estimators from one window to the next.
+def _evaluate_windows(values, columns, ends, window, k_ar_diff):
+    index = {name: i for i, name in enumerate(columns)}
+    pairs = list(combinations(columns, 2))
+    kendall = {pair: RollingKendall(values[:, index[pair[0]]], values[:, index[pair[1]]]) for pair in pairs}
+    spearman = {pair: RollingSpearman(values[:, index[pair[0]]], values[:, index[pair[1]]]) for pair in pairs}
+    johansen = RollingJohansen(values, k_ar_diff)
+
+    result = {}
+    for pair in pairs:
+        result[f'Spearman {pair[0]} - {pair[1]}'] = np.empty(len(ends))
+        result[f'Kendall {pair[0]} - {pair[1]}'] = np.empty(len(ends))
+    trace = np.empty((len(ends), len(columns)))
+    for i, end in enumerate(ends):
+        lo, hi = end - window + 1, end + 1
+        for pair in pairs:
+            spearman[pair].move(lo, hi)
+            kendall[pair].move(lo, hi)
+            result[f'Spearman {pair[0]} - {pair[1]}'][i] = spearman[pair].value()
+            result[f'Kendall {pair[0]} - {pair[1]}'][i] = kendall[pair].value()
+        johansen.move(lo, hi)
+        trace[i] = johansen.value()
+    for rank in range(len(columns)):
+        result[f'Johansen trace r <= {rank}'] = trace[:, rank]
+    return result
+
+
+# End positions of the windows over n rows
+def window_ends(n, window, step):
+    if window < 3 or step < 1:
+        raise ValueError("window must be at least 3 and step at least 1")
+    ends = np.arange(window - 1, n, step)
+    if len(ends) == 0:
+        raise ValueError("window is longer than the data")
+    return ends
+
+
+# Scheduler job: rolling rank correlations (every column pair) and Johansen trace
+# statistics of the given column arrays, one array per statistic, for the count
+# windows ending at rows first, first + step, ... of the arrays. Each window is an
+# incremental update of the previous one; the arrays start with the first window's
+# own warm-up rows, so contiguous chunks of windows can run as separate jobs.
+def rolling_columns(arrays, columns, window, step, k_ar_diff, first, count):
+    values = np.column_stack(arrays).astype(np.float64)
+    ends = first + step * np.arange(count)
+    return _evaluate_windows(values, list(columns), ends, window, k_ar_diff)
+
+
+# Chunk results, in window order, joined into one result
+def join_chunks(chunks):
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+
+# Frame of a rolling_columns result, dated by the last day of each window
+def rolling_frame(dates, result, window=DEFAULT_WINDOW, step=DEFAULT_STEP):
+    frame = pd.DataFrame(result)
+    frame.insert(0, 'Date', np.asarray(dates)[window_ends(len(dates), window, step)])
+    return frame
+
+
+# Rolling statistics computed in this process, for scripts and notebooks
+def rolling_statistics(dates, values, columns, window=DEFAULT_WINDOW, step=DEFAULT_STEP, k_ar_diff=1):
+    values = np.asarray(values, dtype=np.float64)
+    arrays = [values[:, i] for i in range(values.shape[1])]
+    count = len(window_ends(len(values), window, step))
+    return rolling_frame(dates, rolling_columns(arrays, columns, window, step, k_ar_diff, window - 1, count),
+                         window, step)
+
+
+def sidecar_path(path, window, step):
+    root, _ = os.path.splitext(path)
+    return f'{root}.rolling-w{window}-s{step}.parquet'
+
+
+# Every sidecar of a dataset, whatever its parameters
+def sidecar_paths(path):
+    root, _ = os.path.splitext(path)
+    return glob.glob(f'{glob.escape(root)}.rolling-w*-s*.parquet')
+
+
+# Keeps the MAX_SIDECARS most recently used sidecars; reads touch their file
+def evict_sidecars(path, keep=MAX_SIDECARS):
+    paths = []
+    for sidecar in sidecar_paths(path):
+        try:
+            paths.append((os.path.getmtime(sidecar), sidecar))
+        except OSError:
+            pass
+    for _, sidecar in sorted(paths, reverse=True)[keep:]:
+        try:
+            os.remove(sidecar)
+        except OSError:
+            pass
+
+
+# The sidecar's frame when it was written for params, None when it is missing or stale
+def read_sidecar(path, params):
+    try:
+        table = pq.read_table(path)
+    except (OSError, pa.ArrowInvalid):
+        # missing, or evicted by another session between the check and the read
+        return None
+    metadata = table.schema.metadata or {}
+    if json.loads(metadata.get(METADATA_KEY, b'{}')) != params:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return table.to_pandas()
+
+
+def write_sidecar(path, frame, params):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           METADATA_KEY: json.dumps(params).encode()})
+    # readers only ever see a complete file
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+# Futures of the rolling frames being computed, by (sidecar path, parameters)
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+# The chunk jobs of one rolling request. When the last one finishes the frame is
+# assembled, the sidecar written and the Future every waiting session holds resolved.
+class RollingBuild:
+
+    def __init__(self, key, dataset_path, path, params, dates, jobs):
+        self.key = key
+        self.dataset_path = dataset_path
+        self.path = path
+        self.params = params
+        self.dates = dates
+        self.jobs = jobs
+        self.future = Future()
+        self._remaining = len(jobs)
+        self._lock = threading.Lock()
+
+    def start(self):
+        for job in self.jobs:
+            job.add_done_callback(self._job_done)
+
+    def _job_done(self, job):
+        with self._lock:
+            self._remaining -= 1
+            if self._remaining:
+                return
+        try:
+            result = join_chunks([job.result() for job in self.jobs])
+            frame = rolling_frame(self.dates, result, self.params['window'], self.params['step'])
+        except Exception as exc:
+            self.future.set_exception(exc)
+        else:
+            try:
+                write_sidecar(self.path, frame, self.params)
+                evict_sidecars(self.dataset_path)
+            except OSError:
+                # the frame is still served; the next request recomputes it
+                pass
+            self.future.set_result(frame)
+        finally:
+            with _pending_lock:
+                _pending.pop(self.key, None)
+
+
+# One scheduler job per contiguous chunk of windows, a chunk per pool worker.
+# Every chunk gets the rows of its own first window, so the chunks are independent.
+def submit_chunks(store, columns, window, step, k_ar_diff):
+    scheduler = get_scheduler()
+    slicer = get_slicer(store)
+    ends = window_ends(len(slicer.dates), window, step)
+    jobs = []
+    for part in np.array_split(ends, scheduler.max_workers):
+        if len(part) == 0:
+            continue
+        lo, hi = slicer.bounds(slicer.dates[part[0] - window + 1], slicer.dates[part[-1]])
+        jobs.append(scheduler.submit(rolling_columns, store, columns, slicer.dates[lo], slicer.dates[hi - 1],
+                                     tuple(columns), window, step, k_ar_diff, int(part[0] - lo), len(part)))
+    return slicer.dates, jobs
+
+
+def _failed(exc):
+    future = Future()
+    future.set_exception(exc)
+    return future
+
+
+# Rolling statistics for the store's current version, as a Future of the frame.
+# A sidecar parquet file matching the dataset version and parameters is read
+# directly; otherwise the windows are computed in chunks on the shared
+# ComputeScheduler and the sidecar is written when the last chunk finishes.
+# Sessions asking for the same parameters share one Future, and only the
+# MAX_SIDECARS most recently used parameter sets keep a sidecar. Errors, such as
+# a window longer than the data, are raised by future.result().
+def load_rolling(store, columns, window=DEFAULT_WINDOW, step=DEFAULT_STEP, k_ar_diff=1):
+    params = {'version': store.version, 'columns': list(columns), 'window': window,
+              'step': step, 'k_ar_diff': k_ar_diff}
+    path = sidecar_path(store.path, window, step)
+    key = (path, json.dumps(params))
+    future = _pending.get(key)
+    if future is not None:
+        return future
+    frame = read_sidecar(path, params)
+    if frame is not None:
+        future = Future()
+        future.set_result(frame)
+        return future
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is not None:
+            return future
+        try:
+            dates, jobs = submit_chunks(store, columns, window, step, k_ar_diff)
+        except ValueError as exc:
+            return _failed(exc)
+        build = RollingBuild(key, store.path, path, params, dates, jobs)
+        _pending[key] = build.future
+    build.start()
+    return build.future
@@ -0,0 +1,143 @@
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_store import DerivedObjects
+from slicing import DateSlicer, get_slicer
+
+
+# Pandas period alias of every rollup, coarsest first
+RESOLUTIONS = {
+    'Quarterly': 'Q',
+    'Monthly': 'M',
+    'Weekly': 'W-FRI',
+}
+# Roughly the plot width in pixels: a resolution is only used if it gives at least this many points
+CHART_POINTS = 700
+LEVEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Mean']
+# Groupby aggregation behind each level field
+AGGREGATIONS = ['first', 'max', 'min', 'last', 'mean']
+METADATA_KEY = b'rollup'
+
+
+def is_return(column):
+    return column.endswith('Daily Return')
+
+
+# Column of a rollup that stands in for a daily column on a chart
+def chart_column(column):
+    return column if is_return(column) else f'{column} Close'
+
+
+# Aggregate daily rows into periods: OHLC/mean for prices and yields, compounded returns
+# (in percent, like the daily columns) for the Daily Return columns. One groupby pass
+# covers every level column and one more every return column.
+def aggregate(frame, freq):
+    period = frame['Date'].dt.to_period(freq).dt.start_time
+    grouped = frame.groupby(period, sort=True)
+    columns = [column for column in frame.columns if column != 'Date']
+    levels = [column for column in columns if not is_return(column)]
+    returns = [column for column in columns if is_return(column)]
+    parts = [grouped['Date'].max(), grouped.size().rename('Days')]
+    if levels:
+        stats = grouped[levels].agg(AGGREGATIONS)
+        names = dict(zip(AGGREGATIONS, LEVEL_FIELDS))
+        stats.columns = [f'{column} {names[aggregation]}' for column, aggregation in stats.columns]
+        parts.append(stats)
+    if returns:
+        growth = np.log1p(frame[returns] / 100).groupby(period, sort=True).sum()
+        parts.append(np.expm1(growth) * 100)
+    out = pd.concat(parts, axis=1)
+    # same column order as the daily frame
+    order = ['Date', 'Days'] + [name for column in columns
+                                for name in ([column] if is_return(column) else
+                                             [f'{column} {field}' for field in LEVEL_FIELDS])]
+    out = out[order].copy()
+    out.index.name = 'Period'
+    return out.reset_index()
+
+
+def rollup_path(path, name):
+    root, _ = os.path.splitext(path)
+    return f'{root}.rollup-{name.lower()}.parquet'
+
+
+# Bring one rollup file up to date with the daily frame.
+# When the daily data only gained rows at the end, the last stored (possibly partial)
+# period is dropped and re-aggregated together with the new days; anything else
+# (edited history, earlier dates) triggers a full rebuild.
+def update_rollup(frame, path, name, version):
+    freq = RESOLUTIONS[name]
+    target = rollup_path(path, name)
+    stored, meta = None, {}
+    if os.path.exists(target):
+        table = pq.read_table(target)
+        meta = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b'{}'))
+        if meta.get('version') == version:
+            return table
+        stored = table.to_pandas()
+
+    rows = meta.get('rows', 0)
+    dates = frame['Date']
+    appended = (stored is not None and 0 < rows <= len(frame) and
+                str(dates.iloc[0]) == meta.get('first_date') and str(dates.iloc[rows - 1]) == meta.get('last_date'))
+    if appended:
+        cutoff = stored['Period'].iloc[-1]
+        fresh = aggregate(frame[dates >= cutoff], freq)
+        result = pd.concat([stored[stored['Period'] < cutoff], fresh], ignore_index=True)
+    else:
+        result = aggregate(frame, freq)
+
+    meta = {'version': version, 'rows': len(frame), 'first_date': str(dates.iloc[0]),
+            'last_date': str(dates.iloc[-1])}
+    table = pa.Table.from_pandas(result, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), METADATA_KEY: json.dumps(meta).encode()})
+    # readers only ever see a complete file
+    tmp_path = f'{target}.{uuid.uuid4().hex}.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, target)
+    return table
+
+
+# Weekly/monthly/quarterly rollups of a store, each wrapped in a DateSlicer.
+# A resolution is only aggregated (or read from its file) the first time it is used.
+class Rollups(DerivedObjects):
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.version = store.version
+        self.daily = get_slicer(store)
+
+    def slicer(self, name):
+        return self.derived(name, lambda: DateSlicer(update_rollup(self.store.frame(), self.store.path,
+                                                                   name, self.version)))
+
+    # Whether the rollups cover a daily column (series outside the wide file have none)
+    def has(self, column):
+        return column in self.daily.value_columns
+
+    # Coarsest resolution that still gives CHART_POINTS points over the range, None for daily data.
+    # Periods are counted on the daily dates, so no rollup is built just to be rejected.
+    def pick(self, start, end, points=CHART_POINTS):
+        lo, hi = self.daily.bounds(start, end)
+        if hi - lo < points:
+            return None
+        dates = pd.DatetimeIndex(self.daily.dates[lo:hi])
+        for name, freq in RESOLUTIONS.items():
+            if dates.to_period(freq).nunique() >= points:
+                return name
+        return None
+
+    def slice(self, name, column, start, end):
+        return self.slicer(name).slice(chart_column(column), start, end)
+
+
+# Rollups for the store's current version, updated (incrementally where possible) on reload
+def get_rollups(store):
+    return store.derived('rollups', lambda: Rollups(store))
@@ -0,0 +1,165 @@
+import atexit
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from lru import LRUCache
+from slicing import get_slicer
+
+
+# Worker processes for CPU-heavy jobs; they keep the GIL of the server process free
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Shared-memory blocks kept alive, so jobs submitted just before a reload still find theirs
+KEEP_VERSIONS = 2
+
+
+# Every numeric column of one dataset version, copied once into a shared-memory block
+# that worker processes map instead of receiving pickled arrays.
+class SharedColumns:
+
+    def __init__(self, slicer):
+        arrays = {}
+        for name in slicer.value_columns:
+            values = slicer.column(name)
+            if values.dtype.kind in 'fiu':
+                arrays[name] = np.ascontiguousarray(values, dtype=np.float64)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, sum(a.nbytes for a in arrays.values())))
+        # {column: (byte offset, length)}
+        self.layout = {}
+        offset = 0
+        for name, values in arrays.items():
+            np.ndarray(values.shape, np.float64, buffer=self.shm.buf, offset=offset)[:] = values
+            self.layout[name] = (offset, len(values))
+            offset += values.nbytes
+        self.name = self.shm.name
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Blocks mapped by this worker process, by name
+_attached = {}
+
+
+def _attach(name):
+    shm = _attached.get(name)
+    if shm is None:
+        if len(_attached) >= KEEP_VERSIONS:
+            # older versions are unlinked by the server; drop their mappings here too
+            _attached.pop(next(iter(_attached))).close()
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm
+    return shm
+
+
+# Runs in a worker: rows [lo, hi) of the named columns, as read-only views of the block
+def _run(function, name, layout, columns, lo, hi, args):
+    shm = _attach(name)
+    arrays = []
+    for column in columns:
+        offset, length = layout[column]
+        values = np.ndarray((length,), np.float64, buffer=shm.buf, offset=offset)[lo:hi]
+        values.flags.writeable = False
+        arrays.append(values)
+    return function(arrays, *args)
+
+
+# Process-pool scheduler for CPU-heavy computations over the dataset.
+#
+# A job is function(arrays, *args) over a date range of some columns; function
+# must be importable (module level) so the worker can unpickle it. Identical
+# requests (same function, dataset version, columns, rows and arguments) that
+# are in flight share one Future, whichever session submitted them, and
+# finished ones are kept in an LRU. Futures never block the script run; pages
+# render a placeholder until future.done().
+class ComputeScheduler:
+
+    def __init__(self, max_workers=MAX_WORKERS, cache_size=256):
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+        self._blocks = {}
+        self._inflight = {}
+        self._results = LRUCache(maxsize=cache_size)
+        self.executions = 0
+        self.coalesced = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context('spawn')
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._pool
+
+    # Shared-memory block of a dataset version, published on first use
+    def _block(self, version, slicer):
+        block = self._blocks.get(version)
+        if block is None:
+            block = SharedColumns(slicer)
+            self._blocks[version] = block
+            while len(self._blocks) > KEEP_VERSIONS:
+                self._blocks.pop(next(iter(self._blocks))).close()
+        return block
+
+    def submit(self, function, store, columns, start, end, *args):
+        version = store.version
+        slicer = get_slicer(store)
+        lo, hi = slicer.bounds(start, end)
+        key = (function.__module__, function.__qualname__, version, tuple(columns), lo, hi, args)
+        future = self._results.get(key)
+        if future is not None:
+            return future
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            block = self._block(version, slicer)
+            future = self._get_pool().submit(_run, function, block.name, block.layout,
+                                             list(columns), lo, hi, args)
+            self._inflight[key] = future
+            self.executions += 1
+        future.add_done_callback(functools.partial(self._finish, key))
+        return future
+
+    def _finish(self, key, future):
+        with self._lock:
+            if future.cancelled():
+                pass
+            elif isinstance(future.exception(), BrokenProcessPool):
+                # a worker died; the next submit starts a fresh pool and retries
+                self._pool = None
+            else:
+                # errors such as a singular matrix are as deterministic as results
+                self._results.put(key, future)
+            self._inflight.pop(key, None)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            for block in self._blocks.values():
+                block.close()
+            self._blocks.clear()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+# Process-wide scheduler shared by every session
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = ComputeScheduler()
+                atexit.register(_scheduler.shutdown)
+    return _scheduler
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from lru import LRUCache
+from slicing import DateSlicer
+
+
+# Suffixes that split a wide column name into (symbol, metric), e.g. 'Gold Daily Return'
+METRICS = ['Daily Return', 'Price', 'Yield']
+# Small row groups keep a single (symbol, metric) series to a handful of groups
+ROW_GROUP_SIZE = 2048
+METADATA_KEY = b'catalog'
+
+
+def split_column(name):
+    for metric in METRICS:
+        if name.endswith(' ' + metric):
+            return name[:-len(metric) - 1], metric
+    return None
+
+
+def long_path(path):
+    root, _ = os.path.splitext(path)
+    return f'{root}.long.parquet'
+
+
+# Wide (Date + one column per symbol/metric) table -> long (symbol, metric, date, value) table,
+# sorted by symbol, metric and date, with dictionary-encoded symbol and metric columns
+def to_long(table, date_column='Date'):
+    dates = table[date_column]
+    symbols, metrics, values = [], [], []
+    for name in table.column_names:
+        parts = split_column(name)
+        if parts is None:
+            continue
+        symbols.append(pa.array(np.full(len(table), parts[0], dtype=object), pa.string()))
+        metrics.append(pa.array(np.full(len(table), parts[1], dtype=object), pa.string()))
+        values.append(table[name])
+    long = pa.table({
+        'symbol': pa.chunked_array(symbols),
+        'metric': pa.chunked_array(metrics),
+        'date': pa.chunked_array([dates] * len(values)) if values else dates.slice(0, 0),
+        'value': pa.chunked_array([chunk for column in values for chunk in column.chunks], pa.float64()),
+    })
+    order = pc.sort_indices(long, sort_keys=[('symbol', 'ascending'), ('metric', 'ascending'),
+                                             ('date', 'ascending')])
+    long = long.take(order)
+    return long.set_column(0, 'symbol', pc.dictionary_encode(long['symbol'])) \
+               .set_column(1, 'metric', pc.dictionary_encode(long['metric']))
+
+
+# Catalog of every series: {symbol: {metric: {'first', 'last', 'rows'}}}
+def build_catalog(long):
+    catalog = {}
+    grouped = long.group_by(['symbol', 'metric']).aggregate([('date', 'min'), ('date', 'max'), ('value', 'count')])
+    for row in grouped.to_pylist():
+        catalog.setdefault(row['symbol'], {})[row['metric']] = {
+            'first': str(row['date_min'].date()),
+            'last': str(row['date_max'].date()),
+            'rows': row['value_count'],
+        }
+    return catalog
+
+
+def write_long(long, path, version):
+    metadata = {METADATA_KEY: json.dumps({'version': version, 'series': build_catalog(long)}).encode()}
+    long = long.replace_schema_metadata({**(long.schema.metadata or {}), **metadata})
+    tmp_path = f'{path}.tmp'
+    pq.write_table(long, tmp_path, row_group_size=ROW_GROUP_SIZE, write_statistics=True)
+    os.replace(tmp_path, path)
+
+
+# Long-format, multi-series parquet store.
+#
+# Reads are pushed down to the parquet row groups: the symbol, metric and date
+# predicates are checked against each row group's min/max statistics (Arrow does
+# not prune dictionary columns on its own), so one series over one date range
+# only reads the row groups that hold it. The catalog lives in the file
+# metadata and is available without scanning any data.
+class SeriesStore:
+
+    def __init__(self, path, cache_size=64):
+        self.path = path
+        self.file = pq.ParquetFile(path, memory_map=True)
+        meta = json.loads(self.file.schema_arrow.metadata[METADATA_KEY])
+        self.version = meta['version']
+        self.catalog = meta['series']
+        self._stats = [self._group_stats(i) for i in range(self.file.metadata.num_row_groups)]
+        self._lock = threading.Lock()
+        self._slicers = LRUCache(maxsize=cache_size)
+
+    # {column: (min, max)} of one row group
+    def _group_stats(self, index):
+        group = self.file.metadata.row_group(index)
+        stats = {}
+        for i in range(group.num_columns):
+            column = group.column(i)
+            if column.statistics is not None and column.statistics.has_min_max:
+                stats[column.path_in_schema] = (column.statistics.min, column.statistics.max)
+        return stats
+
+    def symbols(self):
+        return sorted(self.catalog)
+
+    def metrics(self, symbol):
+        return sorted(self.catalog[symbol], key=lambda metric: (metric == 'Daily Return', metric))
+
+    # Indices of the row groups whose statistics admit the predicate
+    def row_groups(self, symbol, metric, start=None, end=None):
+        start = None if start is None else np.datetime64(start, 'ns')
+        end = None if end is None else np.datetime64(end, 'ns')
+        selected = []
+        for index, stats in enumerate(self._stats):
+            if 'symbol' in stats and not stats['symbol'][0] <= symbol <= stats['symbol'][1]:
+                continue
+            if 'metric' in stats and not stats['metric'][0] <= metric <= stats['metric'][1]:
+                continue
+            if 'date' in stats:
+                low, high = (np.datetime64(value, 'ns') for value in stats['date'])
+                if (start is not None and high < start) or (end is not None and low > end):
+                    continue
+            selected.append(index)
+        return selected
+
+    # (Date, value) table of one series, optionally limited to [start, end]
+    def read(self, symbol, metric, start=None, end=None):
+        with self._lock:
+            table = self.file.read_row_groups(self.row_groups(symbol, metric, start, end))
+        condition = (ds.field('symbol') == symbol) & (ds.field('metric') == metric)
+        if start is not None:
+            condition &= ds.field('date') >= pa.scalar(np.datetime64(start, 'ns'), pa.timestamp('ns'))
+        if end is not None:
+            condition &= ds.field('date') <= pa.scalar(np.datetime64(end, 'ns'), pa.timestamp('ns'))
+        table = table.filter(condition).select(['date', 'value'])
+        return table.rename_columns(['Date', 'value'])
+
+    # DateSlicer over one full series, kept in an LRU of recently viewed series
+    def slicer(self, symbol, metric):
+        return self._slicers.get_or_compute((symbol, metric), lambda: DateSlicer(self.read(symbol, metric)))
+
+
+# Long-format file of the store's current version, reused when it was written for it
+def open_series_store(store):
+    version = store.version
+    path = long_path(store.path)
+    series_store = SeriesStore(path) if os.path.exists(path) else None
+    if series_store is None or series_store.version != version:
+        write_long(to_long(store.table()), path, version)
+        series_store = SeriesStore(path)
+    return series_store
+
+
+# Long-format store derived from the dataset store, rebuilt when the dataset changes
+def get_series_store(store):
+    return store.derived('series_store', lambda: open_series_store(store))
@@ -0,0 +1,84 @@
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from data_store import DerivedObjects
+from lru import LRUCache
+
+
+# A contiguous date range of one column: both arrays are views into the store's buffers
+SeriesSlice = namedtuple('SeriesSlice', ['column', 'dates', 'values'])
+
+
+# Arrow column -> read-only NumPy view (zero-copy for null-free numeric and timestamp columns)
+def column_view(table, name):
+    column = table[name]
+    if column.num_chunks != 1:
+        column = column.combine_chunks()
+    else:
+        column = column.chunk(0)
+    values = column.to_numpy(zero_copy_only=False)
+    values.flags.writeable = False
+    return values
+
+
+# Time-indexed slicing over a sorted, immutable date index.
+#
+# Bounds are found with a binary search on the index, so a date range costs
+# O(log n) and returns views of only the requested column instead of masking
+# and copying the whole frame. Recent (column, start, end) slices are kept in
+# an LRU so sweeping the date picker is served from memory. Caches built on top
+# of a slicer (downsampling, density) hang off it with slicer.derived().
+class DateSlicer(DerivedObjects):
+
+    def __init__(self, table, date_column='Date', cache_size=256):
+        super().__init__()
+        self.dates = column_view(table, date_column).astype('datetime64[ns]', copy=False)
+        if self.dates.size > 1 and np.any(self.dates[1:] < self.dates[:-1]):
+            raise ValueError(f"'{date_column}' must be sorted in ascending order")
+        self._table = table
+        self.value_columns = [name for name in table.column_names if name != date_column]
+        self._columns = {}
+        self._lock = threading.Lock()
+        self._cache = LRUCache(maxsize=cache_size)
+
+    @property
+    def min_date(self):
+        return self.dates[0]
+
+    @property
+    def max_date(self):
+        return self.dates[-1]
+
+    def column(self, name):
+        values = self._columns.get(name)
+        if values is None:
+            with self._lock:
+                values = self._columns.get(name)
+                if values is None:
+                    values = column_view(self._table, name)
+                    self._columns[name] = values
+        return values
+
+    # Half-open positional bounds [lo, hi) of the rows with start <= date <= end
+    def bounds(self, start, end):
+        start = np.datetime64(start, 'ns')
+        end = np.datetime64(end, 'ns')
+        lo = int(np.searchsorted(self.dates, start, side='left'))
+        hi = int(np.searchsorted(self.dates, end, side='right'))
+        return lo, max(lo, hi)
+
+    def slice(self, column, start, end):
+        key = (column, np.datetime64(start, 'ns'), np.datetime64(end, 'ns'))
+        result = self._cache.get(key)
+        if result is None:
+            lo, hi = self.bounds(start, end)
+            result = SeriesSlice(column, self.dates[lo:hi], self.column(column)[lo:hi])
+            self._cache.put(key, result)
+        return result
+
+
+# Slicer for the store's current version; rebuilt only when the dataset reloads
+def get_slicer(store):
+    return store.derived('slicer', lambda: DateSlicer(store.table()))
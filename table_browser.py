@@ -0,0 +1,151 @@
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from lru import LRUCache
+from tracing import traced
+
+
+PAGE_SIZES = [25, 50, 100, 500]
+# Decoded row groups kept for page flips when the pager reads the file itself
+GROUP_CACHE_BYTES = 128 * 1024 * 1024
+
+
+# Paged, read-only access to a parquet file.
+#
+# Unsorted, unfiltered pages are served by reading only the row groups that
+# overlap the page. Sorting and filtering read just the key columns, compute
+# the matching row ids with Arrow compute, and then fetch the page's rows from
+# the row groups that hold them. The full table is never converted to pandas.
+#
+# Given the already loaded Arrow table of the file (the DatasetStore's), columns
+# and rows are taken from it instead and the file is only used for its statistics.
+class ParquetPager:
+
+    def __init__(self, path, date_column='Date', table=None):
+        self.path = path
+        self.date_column = date_column
+        self.table = table
+        self.file = pq.ParquetFile(path, memory_map=True)
+        self.metadata = self.file.metadata
+        self.columns = self.file.schema_arrow.names
+        sizes = [self.metadata.row_group(i).num_rows for i in range(self.metadata.num_row_groups)]
+        # first global row id of every row group, plus the total row count
+        self.offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+        self._lock = threading.Lock()
+        self._selections = LRUCache(maxsize=16)
+        self._groups = LRUCache(maxsize=64, maxbytes=GROUP_CACHE_BYTES, sizeof=lambda table: table.nbytes)
+
+    @property
+    def num_rows(self):
+        return int(self.offsets[-1])
+
+    # (min, max) of a column from the row group statistics, without reading any data
+    def column_range(self, name):
+        index = self.columns.index(name)
+        lows, highs = [], []
+        for i in range(self.metadata.num_row_groups):
+            stats = self.metadata.row_group(i).column(index).statistics
+            if stats is None or not stats.has_min_max:
+                return None
+            lows.append(stats.min)
+            highs.append(stats.max)
+        return (min(lows), max(highs)) if lows else None
+
+    @traced('parquet.read_column')
+    def _read_column(self, name):
+        if self.table is not None:
+            column = self.table[name]
+        else:
+            with self._lock:
+                column = self.file.read(columns=[name])[name]
+        if name == self.date_column and not pa.types.is_timestamp(column.type):
+            column = pc.cast(column, pa.timestamp('ns'))
+        return column
+
+    def _read_row_group(self, group):
+        with self._lock:
+            return self.file.read_row_group(group)
+
+    # Rows at the given global ids, in that order, decoding only the row groups that hold them
+    @traced('parquet.take')
+    def take(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.table is not None:
+            return self.table.take(pa.array(ids))
+        if len(ids) == 0:
+            return self.file.schema_arrow.empty_table()
+        order = np.argsort(ids, kind='stable')
+        sorted_ids = ids[order]
+        groups = np.searchsorted(self.offsets, sorted_ids, side='right') - 1
+        parts = []
+        for group in np.unique(groups):
+            local = sorted_ids[groups == group] - self.offsets[group]
+            group = int(group)
+            table = self._groups.get_or_compute(group, lambda: self._read_row_group(group))
+            parts.append(table.take(pa.array(local)))
+        rows = pa.concat_tables(parts)
+        # undo the grouping so rows come back in the requested order
+        return rows.take(pa.array(np.argsort(order, kind='stable')))
+
+    # Global ids of the rows passing the date range and value filters
+    def _matching_ids(self, date_range=None, value_filter=None):
+        mask = None
+        if date_range is not None:
+            dates = self._read_column(self.date_column)
+            start = pa.scalar(np.datetime64(date_range[0], 'ns'), pa.timestamp('ns'))
+            end = pa.scalar(np.datetime64(date_range[1], 'ns'), pa.timestamp('ns'))
+            mask = pc.and_(pc.greater_equal(dates, start), pc.less_equal(dates, end))
+        if value_filter is not None:
+            name, low, high = value_filter
+            values = self._read_column(name)
+            condition = pc.and_(pc.greater_equal(values, low), pc.less_equal(values, high))
+            mask = condition if mask is None else pc.and_(mask, condition)
+        if mask is None:
+            return None
+        return pc.indices_nonzero(mask)
+
+    # Ordered global ids of the selected rows (None when every row is selected in file order).
+    # Kept in a small LRU so flipping through pages does not re-filter or re-sort.
+    def select(self, sort_by=None, descending=False, date_range=None, value_filter=None):
+        if date_range is not None:
+            date_range = tuple(np.datetime64(value, 'ns') for value in date_range)
+        key = (sort_by, descending, date_range, value_filter)
+        return self._selections.get_or_compute(key, lambda: self._select(*key))
+
+    def _select(self, sort_by, descending, date_range, value_filter):
+        ids = self._matching_ids(date_range, value_filter)
+        if sort_by is not None:
+            keys = self._read_column(sort_by)
+            if ids is None:
+                ids = pa.array(np.arange(self.num_rows, dtype=np.int64))
+            else:
+                keys = keys.take(ids)
+            order = pc.array_sort_indices(keys, order='descending' if descending else 'ascending')
+            ids = ids.take(order)
+        return ids
+
+    # Number of rows passing the filters
+    def count(self, date_range=None, value_filter=None):
+        ids = self.select(None, False, date_range, value_filter)
+        return self.num_rows if ids is None else len(ids)
+
+    # One page of rows and the number of rows matching the filters
+    def page(self, page, page_size, sort_by=None, descending=False, date_range=None, value_filter=None):
+        ids = self.select(sort_by, descending, date_range, value_filter)
+        total = self.num_rows if ids is None else len(ids)
+        start = max(0, min(page * page_size, total))
+        stop = min(start + page_size, total)
+        if ids is None:
+            positions = np.arange(start, stop, dtype=np.int64)
+        else:
+            positions = ids.slice(start, stop - start).to_numpy(zero_copy_only=False)
+        return self.take(positions), total
+
+
+# Pager over the store's current table; reopened only when the dataset reloads
+def get_pager(store):
+    return store.derived('pager', lambda: ParquetPager(store.path, table=store.table()))
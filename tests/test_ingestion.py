@@ -0,0 +1,68 @@
+import datetime
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import ingestion
+from data_store import DatasetStore
+
+
+# Synthetic responses laid out by URL path the way --record saves them. They are not
+# recordings: the values are those of final_data.parquet around New Year 2019, wrapped
+# in the structure of each source (sdbullion page chrome, summary and footer tables,
+# a closed-market row; AlphaVantage and Yahoo chart JSON with all their fields).
+# Replace them with `ingestion.py --record` captures when the network is available.
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'ingestion')
+START = datetime.date(2018, 12, 1)
+END = datetime.date(2019, 1, 31)
+
+
+# Every source pointed at a local server replaying the fixtures
+@pytest.fixture
+def offline(monkeypatch):
+    server = ingestion.serve_fixtures(FIXTURES)
+    for name in ('GOLD_URL', 'ALPHAVANTAGE_URL', 'YAHOO_CHART_URL'):
+        monkeypatch.setattr(ingestion, name, getattr(ingestion, name))
+    ingestion.use_base_url(f'http://127.0.0.1:{server.server_address[1]}')
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+# Only the daily rows of a page are prices: header, summary, closed-market and footer rows are not
+def test_parse_gold_page_skips_other_rows():
+    with open(os.path.join(FIXTURES, 'gold-prices-2018')) as f:
+        frame = ingestion.parse_gold_page(f.read())
+    assert len(frame) == 24
+    assert frame['Date'].min() == pd.Timestamp('2018-11-26')
+    assert pd.Timestamp('2018-12-05') not in set(frame['Date'])
+    assert frame['value'].between(1100, 1400).all()
+
+
+def test_ingest_and_build_offline(offline, tmp_path):
+    dataset_dir = str(tmp_path / 'data')
+    out_path = str(tmp_path / 'final_data.parquet')
+
+    added = ingestion.ingest(START, END, dataset_dir, max_workers=2)
+    # the fixtures hold 40 trading days in the range, and a few on either side of it
+    assert added == {'sp500': 40, 'gold': 40, 'ten_year': 40}
+    # the first common day has no daily return and is dropped
+    assert ingestion.build_final(dataset_dir, out_path) == 39
+
+    built = pd.read_parquet(out_path)
+    assert list(built.columns) == ['Date'] + list(ingestion.SOURCES.values()) + list(
+        ingestion.RETURN_COLUMNS.values())
+    assert built['Date'].iloc[0] == '2018-12-04' and built['Date'].iloc[-1] == '2019-01-31'
+    # both gold page date formats parse, and prices match the fixtures
+    gold = built.set_index('Date')['Gold Price']
+    assert gold['2018-12-31'] == pytest.approx(1281.65, abs=0.01)
+    assert gold['2019-01-02'] == pytest.approx(1320.75, abs=0.01)
+    assert built[list(ingestion.SOURCES.values())].notna().all().all()
+    # the app's store parses the rebuilt file's dates, whatever string type pandas wrote them as
+    assert pa.types.is_timestamp(DatasetStore(out_path).table().schema.field('Date').type)
+
+    # everything in the range is stored, so a second run appends nothing
+    assert ingestion.ingest(START, END, dataset_dir, max_workers=2) == {'sp500': 0, 'gold': 0, 'ten_year': 0}
+    assert ingestion.build_final(dataset_dir, out_path) == 39
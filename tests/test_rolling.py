@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from scipy import stats
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
+
+from rolling import (RollingJohansen, RollingKendall, RollingSpearman, join_chunks, rolling_columns,
+                     rolling_statistics, window_ends)
+
+
+WINDOW = 250
+STEP = 37
+
+
+# Three random walks, rounded so the rank statistics see ties
+@pytest.fixture(scope='module')
+def levels():
+    rng = np.random.default_rng(510)
+    walks = np.cumsum(rng.normal(size=(1200, 3)), axis=0) + [1000.0, 300.0, 5.0]
+    return np.round(walks, 1)
+
+
+def windows(n):
+    return [(end - WINDOW + 1, end + 1) for end in window_ends(n, WINDOW, STEP)]
+
+
+def test_rank_correlations_match_scipy(levels):
+    x, y = levels[:, 0], levels[:, 1]
+    kendall, spearman = RollingKendall(x, y), RollingSpearman(x, y)
+    for lo, hi in windows(len(levels)):
+        kendall.move(lo, hi)
+        spearman.move(lo, hi)
+        assert kendall.value() == pytest.approx(stats.kendalltau(x[lo:hi], y[lo:hi])[0], abs=1e-12)
+        assert spearman.value() == pytest.approx(stats.spearmanr(x[lo:hi], y[lo:hi])[0], abs=1e-12)
+
+
+def test_johansen_trace_matches_statsmodels(levels):
+    johansen = RollingJohansen(levels, k_ar_diff=1)
+    for lo, hi in windows(len(levels)):
+        johansen.move(lo, hi)
+        expected = coint_johansen(levels[lo:hi], 0, 1).lr1
+        np.testing.assert_allclose(johansen.value(), expected, rtol=1e-8, atol=1e-8)
+
+
+# A step wider than the window restarts the estimators instead of sliding them
+def test_disjoint_windows(levels):
+    x, y = levels[:, 0], levels[:, 2]
+    kendall, spearman = RollingKendall(x, y), RollingSpearman(x, y)
+    for lo, hi in [(0, 100), (500, 600), (550, 650)]:
+        kendall.move(lo, hi)
+        spearman.move(lo, hi)
+        assert kendall.value() == pytest.approx(stats.kendalltau(x[lo:hi], y[lo:hi])[0], abs=1e-12)
+        assert spearman.value() == pytest.approx(stats.spearmanr(x[lo:hi], y[lo:hi])[0], abs=1e-12)
+
+
+def test_rolling_statistics_frame(levels):
+    dates = np.arange('2001-01-01', len(levels), dtype='datetime64[D]')
+    columns = ['a', 'b', 'c']
+    frame = rolling_statistics(dates, levels, columns, WINDOW, STEP)
+    ends = window_ends(len(levels), WINDOW, STEP)
+    assert len(frame) == len(ends)
+    assert (frame['Date'].to_numpy() == dates[ends].astype('datetime64[ns]')).all()
+    lo, hi = ends[-1] - WINDOW + 1, ends[-1] + 1
+    assert frame['Kendall a - c'].iloc[-1] == pytest.approx(
+        stats.kendalltau(levels[lo:hi, 0], levels[lo:hi, 2])[0], abs=1e-12)
+
+
+# Chunks of windows computed from their own rows only, as the scheduler jobs do, join
+# into the same result as one pass over every window
+def test_chunks_match_single_pass(levels):
+    columns = ['a', 'b', 'c']
+    arrays = [levels[:, i] for i in range(3)]
+    ends = window_ends(len(levels), WINDOW, STEP)
+    whole = rolling_columns(arrays, columns, WINDOW, STEP, 1, WINDOW - 1, len(ends))
+    chunks = []
+    for part in np.array_split(ends, 3):
+        lo, hi = part[0] - WINDOW + 1, part[-1] + 1
+        chunks.append(rolling_columns([a[lo:hi] for a in arrays], columns, WINDOW, STEP, 1,
+                                      part[0] - lo, len(part)))
+    joined = join_chunks(chunks)
+    for name, values in whole.items():
+        np.testing.assert_allclose(joined[name], values, rtol=1e-9, atol=1e-9)
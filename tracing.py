@@ -0,0 +1,203 @@
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Tracing is off unless APP_TRACING is set; APP_METRICS_PORT also serves /metrics
+ENABLED = os.environ.get('APP_TRACING', '') not in ('', '0')
+METRICS_PORT = int(os.environ.get('APP_METRICS_PORT', '0') or 0)
+# Reruns kept per session for the debug panel
+HISTORY = 20
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+
+
+# Latency histogram with cumulative Prometheus-style buckets
+class Histogram:
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    # [(upper bound, cumulative count)], the last bound is +Inf
+    def cumulative(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        running, out = 0, []
+        for bound, n in zip(self.buckets + (float('inf'),), counts):
+            running += n
+            out.append((bound, running))
+        return out, total, count
+
+
+# Process-wide histograms by span name, shared by every session
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def histogram(name):
+    hist = _histograms.get(name)
+    if hist is None:
+        with _histograms_lock:
+            hist = _histograms.setdefault(name, Histogram())
+    return hist
+
+
+# Spans of one script rerun: [(name, depth, offset seconds, duration seconds)]
+class Trace:
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.perf_counter()
+        self.duration = None
+        self.spans = []
+        self.depth = 0
+
+
+class Span:
+    __slots__ = ('name', 'trace', 'depth', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = getattr(_local, 'trace', None)
+        if self.trace is not None:
+            self.depth = self.trace.depth
+            self.trace.depth += 1
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.started
+        histogram(self.name).observe(duration)
+        if self.trace is not None:
+            self.trace.depth -= 1
+            self.trace.spans.append((self.name, self.depth, self.started - self.trace.started, duration))
+        return False
+
+
+class _NoSpan:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+# Timing span around a stage; a shared no-op context manager when tracing is off
+def span(name):
+    if not ENABLED:
+        return _NO_SPAN
+    return Span(name)
+
+
+# Decorator form of span; when tracing is off the function is returned unchanged
+def traced(name):
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with Span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Collects the spans of one rerun on this thread; yields None when tracing is off.
+# Streamlit stops a rerun by raising, so the trace is closed in finally.
+@contextmanager
+def rerun(label):
+    if not ENABLED:
+        yield None
+        return
+    trace = Trace(label)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = None
+        trace.duration = time.perf_counter() - trace.started
+        histogram('rerun').observe(trace.duration)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Every histogram in the Prometheus text exposition format
+def prometheus_text():
+    lines = ['# HELP app_span_seconds Duration of traced app stages.',
+             '# TYPE app_span_seconds histogram']
+    for name in sorted(_histograms):
+        buckets, total, count = _histograms[name].cumulative()
+        label = _escape(name)
+        for bound, n in buckets:
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'app_span_seconds_bucket{{span="{label}",le="{le}"}} {n}')
+        lines.append(f'app_span_seconds_sum{{span="{label}"}} {total}')
+        lines.append(f'app_span_seconds_count{{span="{label}"}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+# Starts the /metrics endpoint on a daemon thread, once per process. If the port cannot
+# be bound (e.g. another app process already serves it) this is logged once and the
+# endpoint stays off; the app keeps running. Returns None when there is no endpoint.
+def serve_metrics(port=METRICS_PORT, host='127.0.0.1'):
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError as exc:
+                _server_failed = True
+                logging.getLogger(__name__).warning('metrics endpoint disabled: cannot listen on %s:%s (%s)',
+                                                    host, port, exc)
+                return None
+            threading.Thread(target=_server.serve_forever, name='metrics', daemon=True).start()
+    return _server
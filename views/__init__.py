@@ -0,0 +1,9 @@
+import importlib
+
+
+# Page callable that imports its module the first time it is displayed, so a page's
+# heavy dependencies (pandas, plotly, pyarrow, scipy) are only loaded when it is shown
+def lazy(module, function):
+    def page():
+        getattr(importlib.import_module(module), function)()
+    return page
@@ -0,0 +1,179 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from analysis import (PAIRS, PRICE_COLUMNS, correlation_frame, correlation_rows, johansen_frame, johansen_result,
+                      normality_frame, normality_rows)
+from data_store import DATA_PATH, get_store
+from downsample import DEFAULT_BUDGET, downsample
+from rolling import DEFAULT_STEP, DEFAULT_WINDOW, load_rolling
+from scheduler import get_scheduler
+from slicing import get_slicer
+from views.pending import rerun_when_done, when_ready
+
+
+# Long (Date, variable, value) frame of the rolling columns, each reduced to the
+# downsampling budget so the figures stay small whatever the window and step
+def downsampled(rolling, columns, budget=DEFAULT_BUDGET):
+    parts = []
+    for column in columns:
+        dates, values = downsample(rolling['Date'].to_numpy(), rolling[column].to_numpy(), budget)
+        parts.append(pd.DataFrame({'Date': dates, 'variable': column, 'value': values}))
+    return pd.concat(parts, ignore_index=True)
+
+
+def rolling_charts(rolling):
+    correlation_columns = [column for column in rolling.columns if column.startswith(('Spearman', 'Kendall'))]
+    trace_columns = [column for column in rolling.columns if column.startswith('Johansen')]
+    st.plotly_chart(px.line(downsampled(rolling, correlation_columns), x='Date', y='value', color='variable',
+                            title='Rolling Rank Correlation'))
+    st.plotly_chart(px.line(downsampled(rolling, trace_columns), x='Date', y='value', color='variable',
+                            title='Rolling Johansen Trace Statistics'))
+
+
+def analysis_tab():
+    slicer = get_slicer(get_store(DATA_PATH))
+    min_date = pd.Timestamp(slicer.min_date).date()
+    max_date = pd.Timestamp(slicer.max_date).date()
+
+    # User selection for the tested date range and an extra correlation pair
+    date_range = st.sidebar.date_input(
+        "Select date range",
+        value=[min_date, max_date],
+        min_value=min_date,
+        max_value=max_date
+    )
+    start_date, end_date = date_range if len(date_range) == 2 else (min_date, max_date)
+    st.sidebar.caption("Please make sure to select two dates!")
+    first_series = st.sidebar.selectbox('Correlation pair: first series', slicer.value_columns,
+                                        index=slicer.value_columns.index(PAIRS[0][0]))
+    second_series = st.sidebar.selectbox('Correlation pair: second series', slicer.value_columns,
+                                         index=slicer.value_columns.index(PAIRS[0][1]))
+    johansen_columns = st.sidebar.multiselect('Johansen test series', slicer.value_columns,
+                                              default=PRICE_COLUMNS)
+    pairs = list(PAIRS)
+    if first_series != second_series and (first_series, second_series) not in pairs:
+        pairs.append((first_series, second_series))
+
+    # The tests run in worker processes; identical requests from other sessions share one job
+    scheduler = get_scheduler()
+    store = get_store(DATA_PATH)
+    normality = scheduler.submit(normality_rows, store, PRICE_COLUMNS, start_date, end_date)
+    correlations = scheduler.submit(correlation_rows, store, [column for pair in pairs for column in pair],
+                                    start_date, end_date)
+    johansen = None
+    if len(johansen_columns) >= 2:
+        johansen = scheduler.submit(johansen_result, store, johansen_columns, start_date, end_date, 0, 1)
+
+    st.markdown(""" 
+    ## Analysis
+
+    The goal of this project is to investigate the relationships between S&P500 price, gold price, and 10 year Treasury note.
+
+    Step 1: Use visual inspection or statistical tests to check whether the data series is normally distributed.
+
+    Step 2: Chose correlation test or tests according to normality test results.
+
+    Step 3: Explore potential cause-and-effect relationships between the three data series using Johansen Cointegration Test.
+
+    Step 4: More visualization, draw conclusions about the relationship between the data series from statistical tests. 
+
+    ## Test for Normal Distribution:
+
+    Shapiro-Wilson test was performed on each of the three data series over the selected date range:
+    """)
+    when_ready(normality, lambda pvalues: st.dataframe(normality_frame(PRICE_COLUMNS, pvalues), hide_index=True),
+               "Running the normality tests...")
+    st.markdown("""
+    Over the full 2001 to 2019 sample, all three data series have extremely low p-values(p-value < 0.05), in this case we can reject the null hypothesis 
+    and conclude that all the data series are likely NOT normally distributed. There is no need to plot their 
+    histograms since none will follow a symmetrical bell-shaped curve.  
+
+    Next I will conduct non-parametric correlation test(Spearman & Kendall) to assess relationships between the
+    variables.
+
+    ## Test for Correlation:
+
+    Spearman's and Kendall's rank correlation over the selected date range:
+    """)
+    when_ready(correlations, lambda rows: st.dataframe(correlation_frame(pairs, rows), hide_index=True),
+               "Running the correlation tests...")
+    st.markdown("""
+    Over the full sample, both Spearman's rank and Kendall's rank coefficients are positive for the 
+    Gold Price - SP500 Price pair. This indicates a positive monotonic relationship, when the gold price goes up, 
+    there's a tendency for the SP500 price to also go up, and vice versa. 
+
+    The coefficients for both Gold Price - 10 Year T Note Yield and SP500 Price - 10 Year T Note Yield are negative. 
+    This suggests negative monotonic relationships.  Typically, when the yield of the 10-year Treasury note goes up, 
+    it might indicate investors seeking less risky assets. This could lead to a decrease in the price of gold 
+    (considered a safe haven asset) and potentially the stock market (reflected by the SP500).
+
+    ## Cause and effect relationships:
+
+    Johansen cointegration test over the selected date range:
+    """)
+    if johansen is None:
+        st.warning("Please select at least two series for the Johansen test!")
+    else:
+        try:
+            when_ready(johansen, lambda result: st.dataframe(johansen_frame(johansen_columns, result),
+                                                             hide_index=True),
+                       "Running the Johansen test...")
+        except (ValueError, np.linalg.LinAlgError):
+            st.warning("Not enough data in the selected date range for the Johansen test.")
+    st.markdown("""
+    From the Johansen cointegration test results, it appears that there is no evidence to reject the null hypothesis 
+    at conventional significance levels for any number of cointegrating vectors. This suggests that there is no 
+    cointegration among the S&P 500 Price, Gold Price, and 10 Year T Note Yield based on the data provided.
+
+    This implies that the variables do not tend to move together in the long run or do not have any long-term 
+    equilibrium relationship that consistently brings them back together. Each financial series may react 
+    independently to changes in market conditions over the long term.
+
+    ## Conclusion: 
+
+    The investigation into the relationships between the S&P 500 Price, Gold Price, and the 10-Year Treasury Note 
+    Yield has provided several insights through both correlation and causation analysis, albeit with findings 
+    that reflect both short-term relationships and the absence of long-term equilibrium dynamics.
+
+    Correlation Findings:
+    The correlation tests indicated significant relationships among the variables:
+
+    Gold Price and S&P 500 Price: There is a positive monotonic relationship suggesting that movements in the 
+    stock market, as represented by the S&P 500, tend to be associated with similar movements in gold prices. 
+    This relationship can be attributed to investor behavior, where both assets might be viewed as attractive 
+    during certain economic conditions, such as during periods of market confidence or instability, influencing 
+    their prices concurrently. Gold Price and 10-Year T Note Yield & S&P 500 Price and 10-Year T Note Yield: The 
+    negative correlations suggest that as the yield on long-term U.S. government debt increases, 
+    typically indicating rising interest rates or lower bond prices, both gold and S&P 500 prices tend to fall. 
+    This could reflect a shift in investor preference towards safer, income-generating assets when yields are 
+    higher, moving away from stocks and commodities like gold which do not offer a yield. Causation Analysis: The 
+    Johansen cointegration test, aimed at uncovering any long-term equilibrium relationships that might pull 
+    these series back into alignment over time, concluded with no evidence of such dynamics. The lack of 
+    cointegration suggests that while these financial instruments may exhibit short-term correlations:
+
+    Independent Long-term Behavior: In the long term, they appear to operate independently of one another. This 
+    independence implies that any shocks affecting one of the variables are unlikely to have a permanent or 
+    proportional impact on the others over an extended period.
+
+    """)
+
+    # Rolling-window view of how the relationships evolve over time
+    st.markdown("""
+    ## Rolling relationships:
+
+    The full-sample numbers above hide how the relationships change over time. The charts below repeat the rank 
+    correlation and Johansen tests over a rolling window of trading days.
+    """)
+    window = st.sidebar.number_input("Rolling window (days)", min_value=30, max_value=2000,
+                                     value=DEFAULT_WINDOW, step=10)
+    step = st.sidebar.number_input("Rolling step (days)", min_value=1, max_value=250, value=DEFAULT_STEP)
+    rolling = load_rolling(store, PRICE_COLUMNS, int(window), int(step))
+    try:
+        when_ready(rolling, rolling_charts, "Computing rolling statistics...")
+    except (ValueError, np.linalg.LinAlgError):
+        st.warning("Not enough data for the selected rolling window.")
+
+    # Show the test results as soon as the background jobs finish
+    rerun_when_done([normality, correlations, johansen, rolling])
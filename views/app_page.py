@@ -0,0 +1,18 @@
+import streamlit as st
+
+from views import lazy
+
+
+# Each tab lives in its own module and is imported when first opened
+TABS = {
+    "Interactive Data": lazy('views.interactive', 'interactive_data_tab'),
+    "Analysis": lazy('views.analysis_tab', 'analysis_tab'),
+    "Charts": lazy('views.charts', 'charts_tab'),
+}
+
+
+def app_page():
+    # set up three tabs
+    # Create a sidebar radio button to select the tab
+    selected_tab = st.sidebar.radio("Select Tab", list(TABS))
+    TABS[selected_tab]()
@@ -0,0 +1,108 @@
+import base64
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+from data_store import DATA_PATH, get_store
+from density import COLORS, DATE_COLUMN, DEFAULT_RESOLUTION, RESOLUTIONS, render
+from slicing import get_slicer
+
+
+# Axis value of a density image edge; the date index is stored as epoch nanoseconds
+def _axis_value(column, value):
+    return pd.Timestamp(int(value)).isoformat() if column == DATE_COLUMN else value
+
+
+# Density image of y_columns against x_column as a Plotly figure: the data-driven PNG is the
+# background of empty axes, so the browser gets one small image whatever the point count
+def density_chart(slicer, x_column, y_columns, start, end, resolution, title, y_title):
+    rendered = render(slicer, x_column, y_columns, start, end, resolution)
+    (x0, x1), (y0, y1) = rendered.x_range, rendered.y_range
+    width = (x1 - x0) / 1e6 if x_column == DATE_COLUMN else x1 - x0
+    fig = go.Figure()
+    # empty traces only provide the legend entries
+    for i, column in enumerate(y_columns if len(y_columns) > 1 else []):
+        fig.add_trace(go.Scatter(x=[None], y=[None], mode='markers', name=column,
+                                 marker={'color': 'rgb({}, {}, {})'.format(*COLORS[i % len(COLORS)])}))
+    fig.add_layout_image(
+        source='data:image/png;base64,' + base64.b64encode(rendered.png).decode('ascii'),
+        xref='x', yref='y', x=_axis_value(x_column, x0), y=y1, sizex=width, sizey=y1 - y0,
+        sizing='stretch', layer='below',
+    )
+    fig.update_xaxes(title=x_column, range=[_axis_value(x_column, x0), _axis_value(x_column, x1)],
+                     type='date' if x_column == DATE_COLUMN else 'linear', showgrid=False)
+    fig.update_yaxes(title=y_title, range=[y0, y1], showgrid=False)
+    fig.update_layout(title=title, template='plotly_white')
+    st.plotly_chart(fig)
+
+
+def charts_tab():
+    st.title('Charts')
+    slicer = get_slicer(get_store(DATA_PATH))
+    min_date = pd.Timestamp(slicer.min_date).date()
+    max_date = pd.Timestamp(slicer.max_date).date()
+
+    # User selection for the plotted date range and the image resolution
+    date_range = st.sidebar.date_input(
+        "Select date range",
+        value=[min_date, max_date],
+        min_value=min_date,
+        max_value=max_date
+    )
+    st.sidebar.caption("Please make sure to select two dates!")
+    start_date, end_date = date_range if len(date_range) == 2 else (min_date, max_date)
+    resolution = st.sidebar.radio("Image resolution", list(RESOLUTIONS),
+                                  index=list(RESOLUTIONS).index(DEFAULT_RESOLUTION))
+
+    density_chart(slicer, DATE_COLUMN, ['Gold Price', 'SP500 Price'], start_date, end_date, resolution,
+                  'Time Series Plot of Gold and S&P 500 Price', 'Price')
+    st.caption("Gold Price vs SP500 Price")
+    st.markdown("""The line graph provides illustration of the price trends of Gold and the S&P 500 over 
+    approximately two decades, starting from around 2001 up to 2019. During certain periods such as the financial 
+    crisis around 2008, gold and S&P 500 trends diverge, where gold prices rose as the S&P 500 fell sharply, 
+    supporting gold's status as a safe-haven asset during market downturns. Post-2009, as the S&P 500 recovers 
+    and grows, gold prices initially decline, indicating a shift back to riskier assets as market conditions 
+    improve. Both asset classes show significant upward trends towards the latter part of the graph (post-2015), 
+    possibly indicating broad economic factors influencing asset prices, such as monetary policy changes or 
+    global economic conditions. """)
+    st.markdown("""""")
+
+    density_chart(slicer, 'SP500 Price', ['10 Year T Note Yield'], start_date, end_date, resolution,
+                  'Scatter Plot: S&P 500 Price vs 10 Year T Note Yield', '10 Year T Note Yield')
+    st.caption("SP500 Price vs 10 Year Treasury Note")
+    st.markdown("""The scatter plot displaying the relationship between the S&P 500 Price and the 10-Year 
+    Treasury Note Yield reveals distinct clusters indicating varying economic conditions. No clear linear 
+    relationship is evident across the entire dataset; however, within specific clusters, trends suggest that 
+    higher S&P 500 prices often coincide with moderately increasing yields, likely reflecting periods of economic 
+    growth where investors favor equities over bonds. Conversely, other clusters show lower stock prices 
+    associated with higher yields, potentially indicating economic downturns where higher bond yields reflect a 
+    shift towards safer investments. This pattern underscores the complex interplay between equity markets and 
+    bond yields as indicators of investor sentiment and broader economic trends.""")
+    st.markdown("""""")
+
+    density_chart(slicer, 'SP500 Price', ['Gold Price'], start_date, end_date, resolution,
+                  'Scatter Plot: S&P 500 Price vs Gold Price', 'Gold Price')
+    st.caption("SP500 Price vs Gold Price")
+    st.markdown("""The scatter plot illustrating the relationship between the S&P 500 Price and Gold Price shows 
+    a varied pattern without a straightforward linear correlation. Notably, the data points form distinct 
+    clusters, suggesting different phases of market behavior or economic conditions. For example, 
+    there's a cluster where both gold and S&P 500 prices are lower, possibly reflecting times of economic 
+    stability or low inflation expectations. Another prominent cluster occurs at higher gold prices irrespective 
+    of moderate variations in S&P 500 prices, which might indicate periods when investors turn to gold as a safe 
+    haven amid economic uncertainty or market volatility. This visualization highlights the complex and 
+    occasionally inverse relationship between gold and equity markets, reflecting investor sentiment and broader 
+    economic indicators during different periods.""")
+    st.markdown("""""")
+
+    density_chart(slicer, 'Gold Price', ['10 Year T Note Yield'], start_date, end_date, resolution,
+                  'Scatter Plot: Gold Price vs 10 Year T Note Yield', '10 Year T Note Yield')
+    st.caption("Gold Price vs 10 Year T Note")
+    st.markdown("""The scatter plot comparing Gold Price and the 10-Year Treasury Note Yield showcases an inverse 
+    relationship, highlighted by clusters that suggest varying economic conditions. One notable cluster shows 
+    lower gold prices coupled with higher yields, typically indicating strong economic growth and reduced demand 
+    for gold as a safe haven. Conversely, another prominent cluster with higher gold prices and lower yields 
+    suggests periods of economic uncertainty, where gold is favored as a safe investment and yields on safer 
+    assets like Treasury notes decrease. Transition areas between these clusters reflect shifts in investor 
+    sentiment or economic policy changes, illustrating the dynamic interplay between these two key financial 
+    indicators.""")
@@ -0,0 +1,88 @@
+import streamlit as st
+import pandas as pd
+
+from data_store import DATA_PATH, get_store
+from table_browser import PAGE_SIZES, get_pager
+from tracing import span
+
+
+# Data Source Page
+def data_source_page():
+    st.title('Data Sources')
+    st.markdown("""
+    ## Overview of Data Sources
+    This project utilizes two types of data sources, one is scrape-able data from web page, and second is API accessed data:
+
+    **1. Source One(Scrape-able):**
+
+    URL: https://sdbullion.com/gold-prices-{} (substitute {} for desired year)
+
+    This website recoded daily gold price from 1968 to 2023, which provides the daily gold price for my analysis. The website only have monthly prices for earlier years,
+    therefore I picked 2001 to 2019 which all have recorded daily prices. However, the format of the datetime varied
+    from year to year, which added difficulty to scraping. 
+
+    **2. Source Two(Public API):**
+
+    API: https://www.alphavantage.co/query
+
+    Alphavantage api provided free access for most financial market data, and I used it to acquire data for SP500 from 2001 
+    to 2019.
+
+    **3. Source Three:**
+
+    Yahoo Finance via yfinance
+
+    Yahoo Finance also provides financial data, therefore I used yfinance package in Pycharm to acquire data for 10 Year T-note
+    yield from 2001 to 2019. 
+
+
+    **Final data file: final_data.parquet**
+
+    This dataset encompasses a comprehensive collection of financial metrics spanning from 2001 to 2019, 
+    specifically focusing on gold prices, S&P 500 index values, and 10-year Treasury note yields. 
+    The gold price data were meticulously gathered through web scraping techniques, 
+    while the S&P 500 data were sourced via the AlphaVantage API, and the data for 10-year 
+    Treasury note yields were obtained from yfinance. This diverse dataset was initially consolidated 
+    into a CSV file and subsequently converted into a Parquet file format to enhance data handling 
+    and performance for analysis purposes. The transformation to Parquet ensures efficient storage and faster processing, 
+    facilitating more effective data manipulation and analysis in this study.
+
+    """)
+    # Checkbox to control data display
+    show_all_data = st.checkbox("Show entire data")
+
+    if show_all_data:
+        # Display the data one page at a time, only the rows on the page are read
+        with span('get_pager'):
+            pager = get_pager(get_store(DATA_PATH))
+        value_columns = [column for column in pager.columns if column != pager.date_column]
+        first_date, last_date = [pd.Timestamp(value).date() for value in pager.column_range(pager.date_column)]
+
+        col1, col2, col3 = st.columns(3)
+        sort_by = col1.selectbox("Sort by", ['(none)'] + pager.columns)
+        descending = col2.checkbox("Descending")
+        page_size = col3.selectbox("Rows per page", PAGE_SIZES)
+
+        date_range = st.date_input("Filter dates", value=[first_date, last_date],
+                                   min_value=first_date, max_value=last_date)
+        filter_column = st.selectbox("Filter values of", ['(none)'] + value_columns)
+        value_filter = None
+        if filter_column != '(none)':
+            low, high = pager.column_range(filter_column)
+            low, high = st.slider("Value range", min_value=float(low), max_value=float(high),
+                                  value=(float(low), float(high)))
+            value_filter = (filter_column, low, high)
+        if len(date_range) != 2:
+            date_range = (first_date, last_date)
+
+        # the page number is asked for last, once the filtered row count is known
+        with span('filter'):
+            page_count = max(1, -(-pager.count(date_range, value_filter) // page_size))
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+        with span('pager.page'):
+            rows, total = pager.page(int(page) - 1, page_size, None if sort_by == '(none)' else sort_by,
+                                     descending, date_range, value_filter)
+        with span('st.dataframe'):
+            st.dataframe(rows.to_pandas(), hide_index=True)
+        first_row = (int(page) - 1) * page_size
+        st.caption(f"Rows {min(first_row + 1, total)}-{first_row + rows.num_rows} of {total}")
@@ -0,0 +1,19 @@
+from collections import deque
+
+import streamlit as st
+
+from tracing import HISTORY
+
+
+# Sidebar panel with the span breakdown of this session's last reruns
+def debug_panel(trace):
+    history = st.session_state.setdefault('trace_history', deque(maxlen=HISTORY))
+    history.appendleft(trace)
+    with st.sidebar.expander("Timing"):
+        shown = st.slider("Reruns shown", min_value=1, max_value=HISTORY, value=5)
+        for past in list(history)[:shown]:
+            lines = [f"{past.label}  {past.duration * 1000:8.1f} ms"]
+            # spans are recorded as they finish; order them by start for an indented tree
+            for name, depth, offset, duration in sorted(past.spans, key=lambda span: (span[2], span[1])):
+                lines.append(f"{'  ' * (depth + 1)}{name:<{28 - 2 * depth}} {duration * 1000:8.1f} ms")
+            st.code('\n'.join(lines), language=None)
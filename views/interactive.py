@@ -0,0 +1,94 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from client_chart import chart_height, chart_html, plotly_js_url, series_payload
+from data_store import DATA_PATH, get_store
+from derived import REGISTRY, derived_slicer
+from downsample import DEFAULT_BUDGET, METHODS, downsample_slice
+from rollups import RESOLUTIONS, get_rollups, is_return
+from series_store import get_series_store
+from tracing import span
+
+
+def interactive_data_tab():
+    st.title('Interactive Data')
+    with span('get_series_store'):
+        series_store = get_series_store(get_store(DATA_PATH))
+
+    # User selection for commodity, from the series catalog
+    commodity = st.sidebar.selectbox('Select Commodity', series_store.symbols())
+
+    # User selection for metric type: stored series (e.g. Price, Yield or Daily Return) and derived metrics
+    stored_metrics = series_store.metrics(commodity)
+    metric = st.sidebar.radio("Select Metric Type", stored_metrics + list(REGISTRY))
+    selected_column = f"{commodity} {metric}"
+
+    # Only the selected series is read from the store, derived metrics are computed on first use
+    if metric in REGISTRY:
+        level_metric = next(name for name in stored_metrics if not is_return(name))
+        params = {name: int(st.sidebar.number_input(f"{metric} {name}", min_value=2, value=default))
+                  for name, default in REGISTRY[metric].params.items()}
+        slicer = derived_slicer(series_store, commodity, level_metric, metric, **params)
+    else:
+        slicer = series_store.slicer(commodity, metric)
+
+    # Browser mode sends the whole series once; date range, zoom and the linked range slider are
+    # then handled in the browser, so only a change of series reruns the script
+    if st.sidebar.toggle("Filter dates in the browser"):
+        others = {f"{symbol} {name}": (symbol, name) for symbol in series_store.symbols()
+                  for name in series_store.metrics(symbol) if f"{symbol} {name}" != selected_column}
+        linked = st.sidebar.multiselect("Linked series", list(others))
+        series = [series_payload(selected_column, slicer)]
+        series += [series_payload(name, series_store.slicer(*others[name])) for name in linked]
+        # plotly.js comes from this server's static files; without static serving the
+        # browser has to reach cdn.plot.ly, and the chart stays blank offline or under a strict CSP
+        plotly_js = plotly_js_url(st.get_option('server.enableStaticServing'),
+                                  st.get_option('server.baseUrlPath'))
+        with span('st.iframe'):
+            st.iframe(chart_html(f'{selected_column} Trend', series, plotly_js), height=chart_height(len(series)))
+        return
+
+    # set up date for selection
+    min_date = pd.Timestamp(slicer.min_date).date()
+    max_date = pd.Timestamp(slicer.max_date).date()
+
+    # User selection for date range
+    start_date, end_date = st.sidebar.date_input(
+        "Select date range",
+        value=[min_date, max_date],
+        min_value=min_date,
+        max_value=max_date
+    )
+    st.sidebar.caption("Please make sure to select two dates!")
+
+    # Long ranges use the coarsest pre-aggregated rollup that still fills the chart
+    resolution = st.sidebar.radio("Resolution", ['Auto', 'Daily'] + list(reversed(RESOLUTIONS)))
+    if resolution != 'Daily':
+        rollups = get_rollups(get_store(DATA_PATH))
+        if not rollups.has(selected_column):
+            resolution = 'Daily'
+        elif resolution == 'Auto':
+            resolution = rollups.pick(start_date, end_date) or 'Daily'
+
+    # Point budget for the chart, long daily ranges are downsampled on the server
+    downsample_method = st.sidebar.radio("Downsampling", METHODS)
+    point_budget = st.sidebar.slider("Max points", min_value=200, max_value=5000,
+                                     value=DEFAULT_BUDGET, step=100)
+
+    # fetch data: binary-search the sorted date index, only the selected column is sliced
+    with span('filter'):
+        if resolution == 'Daily':
+            dates, values = downsample_slice(slicer, 'value', start_date, end_date,
+                                             point_budget, downsample_method)
+        else:
+            _, dates, values = rollups.slice(resolution, selected_column, start_date, end_date)
+
+    # Displaying the selected graph
+    with span('px.line'):
+        fig = px.line(x=dates, y=values, title=f'{selected_column} Trend ({resolution})',
+                      labels={'x': 'Date', 'y': selected_column})
+    with span('st.plotly_chart'):
+        st.plotly_chart(fig)
+    if resolution != 'Daily':
+        st.caption(f"{resolution} {'compounded returns' if is_return(selected_column) else 'closing values'}")
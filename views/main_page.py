@@ -0,0 +1,70 @@
+import streamlit as st
+
+
+# Main page function
+def main_page():
+    st.title('Financial Analysis Project')
+    st.markdown("""
+    ## Name: Hanqing (Peter) Zhao
+
+    ## How to use this webapp:
+
+    Interactivity:
+
+    - This webapp has four pages, and can be navigated to by clicking under Navigation on the left.
+        - Main Page(default): Display the project name, student name, explanation and analysis for plots and charts, and 
+        conclusion.
+        - Project Reflections: Display additional questions from 4-8 with answers. 
+        - Data Sources: Descriptions of all data sources used by this webapp, with url and apis respectively. Additionally, 
+        a paragraph describing the final parquet file is included as well. 
+        - Interactive Data / Analysis / Charts: This page has three tabs as side bar on the left, allowing user to navigate to interactive
+         data plots, project analysis, and charts. The interactive data tab allow user to utilize the sidebar on the left
+         to select data that they are interested in. The analysis tab has the research plan, methods, and results of the 
+         project. And finally, the charts tab shows additional line graph and scatter plots to visualize the data.""")
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)
+
+    st.markdown("""  
+    Plots & Charts(Brief):
+    - Gold Price vs SP500 Price: 
+        - The line graph provides illustration of the price trends of Gold and the S&P 500 over approximately two decades, starting from around 2001 up to 2019.
+    - SP500 Price vs 10 Year Treasury Note:
+        - The scatter plot displaying the relationship between the S&P 500 Price and the 10-Year 
+        Treasury Note Yield reveals distinct clusters indicating varying economic conditions.
+    - SP500 Price vs Gold Price
+        - The scatter plot illustrating the relationship between the S&P 500 Price and Gold Price shows 
+        a varied pattern without a straightforward linear correlation.
+    - Gold Price vs 10 Year T Note
+        - The scatter plot comparing Gold Price and the 10-Year Treasury Note Yield showcases an inverse 
+        relationship, highlighted by clusters that suggest varying economic conditions.""")
+
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)
+
+    st.markdown("""
+    Conclusion:
+
+    In the long term, the three data series appear to operate independently of one another. This independence implies 
+    that any shocks affecting one of the variables are unlikely to have a permanent or proportional impact on the 
+    others over an extended period. Sad :(
+
+
+    <<<< Full plots/charts, analysis and conclusions are in last pages' tabs
+
+    """)
+
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)
+
+    st.markdown("""
+
+    ## Major “gotchas”
+    - The last page have three tabs, but sometimes you have to scroll up to see them. 
+    - On the Interactive Data / Analysis / Charts page, only one graph can be displayed at a time. This limitation is largely due to 
+    webpage size constrains, better results may be achieved if two plots can be displayed together side by side to help
+    comparison. 
+    - It is hard to have accurate control over the font size, some texts are not the most convenient for reading. 
+    - My ability in using streamlit limits the amount of complex functions that could be achieved on interactive data page.
+    The statistical tests on the Analysis tab are now computed live for the selected date range, but heavier 
+    econometric indicators still have to be added to the app before they can be graphed. 
+    """)
@@ -0,0 +1,28 @@
+import streamlit as st
+
+
+# How often a page waiting on background jobs checks them
+POLL_SECONDS = 0.5
+
+
+# Renders a background job's result once it is done, a placeholder until then
+def when_ready(future, render, message="Computing..."):
+    if not future.done():
+        st.info(message)
+        return
+    render(future.result())
+
+
+# While any job is pending, a fragment polls the jobs without rerunning the page
+# and reruns the whole page once they have all finished
+def rerun_when_done(futures):
+    pending = [future for future in futures if future is not None and not future.done()]
+    if not pending:
+        return
+
+    @st.fragment(run_every=POLL_SECONDS)
+    def poll():
+        if all(future.done() for future in pending):
+            st.rerun()
+
+    poll()
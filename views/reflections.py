@@ -0,0 +1,64 @@
+import streamlit as st
+
+
+# Additional questions
+def qa_page():
+    st.title('Project Reflections')
+    st.markdown("""
+    4. What did you set out to study?
+
+        My milestone 1 was about finding the relationship between pollution and climate change, however, 
+        two of the datasource were down for maintenance. Therefore I started this new project, and in this project, 
+        I set out to explore the interrelationships 
+        between three critical financial indicators: the S&P 500 Price, Gold Price, and the 10-Year Treasury Note Yield. 
+        The aim was to identify and analyze potential correlation and causation patterns among these variables to 
+        understand how they influence each other across different economic conditions. Through statistical analysis and 
+        visual data exploration, the project seeks to uncover insights into how these financial metrics interact.""")
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)
+
+    st.markdown("""    5. What did you Discover/what were your conclusions?
+
+        Throughout this project, I discovered significant insights into the relationships between the S&P 500 Price, 
+        Gold Price, and the 10-Year Treasury Note Yield. The correlation tests, such as Spearman and Kendall's rank, 
+        revealed that while there is a positive correlation between the S&P 500 and Gold Prices, both tend to show a 
+        negative correlation with the 10-Year Treasury Note Yield. This suggests that during periods of economic 
+        uncertainty, investors may favor gold and shy away from the stock market, which often correlates with a rise in 
+        bond yields. Additionally, the Johansen Cointegration Test indicated no long-term equilibrium relationship among 
+        these variables, suggesting that they may react independently to different economic pressures over time. My 
+        conclusion is that while these financial indicators often move in response to similar economic events, 
+        their long-term behaviors remain largely independent, driven by distinct market forces and investor behaviors.""")
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)
+
+    st.markdown("""   6. What difficulties did you have in completing the project?
+
+        Two parts of the project appears to be very challenging. The first being the statistical analysis, I am not the most
+        familiar with quite a few tests and therefore had to learn how and when to use them from square 1. Another challenge
+        turns out to be building the webapp. I enjoyed the process of building the webapp piece by piece, however, 
+        this joyfulness was soon shattered by countless errors and warnings. This is by far the most complicated project 
+        I have every done in the program, since one have to utilize basically everything we've learned in class. 
+        The results are worth it though :)
+    """)
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)
+
+    st.markdown(""" 7. What skills did you wish you had while you were doing the project?
+
+    First of all I wish I am better at python, which would save me tons of trouble debugging or understanding different
+    warnings and how to fix them. Secondly, I wish I know how to code html, which would allow me to scrape from a lot 
+    more web pages which were all too hard to scrape right now. Lastly, I wish I have better time management. 
+    """)
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)
+
+    st.markdown(""" 8. What would you do "next" to expand or augment the project?
+
+    After successfully running tests on timeseries data, I'm looking forward to expanding the dataset with additional 
+    financial data. By doing so, I aim to uncover correlations or significant cause-and-effect relationships between 
+    various variables. Moreover, enriching the dataset with data from different perspectives will enable us to explore 
+    more interesting functions on the interactive data page.
+""")
+
+    st.markdown("""----------------------------------------------------------------------------------------------------
+    """)